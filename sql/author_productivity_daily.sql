@@ -0,0 +1,100 @@
+-- Rollup diario de productividad por autor. Se regenera a diario vía
+-- scheduled query a las 03:00 UTC, junto con fact_daily_metric.
+--
+-- El scatter de autores recomputaba en cada render un join de 3 CTEs entre
+-- el historial editorial y el tráfico por URL. Este rollup deja una fila por
+-- (fecha, editor, sección) con las notas del día y el tráfico del día de las
+-- notas del editor, por tipo de métrica; el loader queda en un solo scan
+-- podado por partición. Cambio de semántica documentado: el tráfico del
+-- período ahora incluye el de todas las notas del autor (también las
+-- trabajadas antes del período), no solo las tocadas dentro de la ventana.
+--
+-- notas_creadas / notas_publicadas son exactas al sumar días (CREATE y
+-- FIRST_PUBLISH ocurren una sola vez por nota); notas_participadas cuenta
+-- la nota en la fecha del primer toque del editor.
+
+CREATE OR REPLACE TABLE `data-prod-454014.Gold.author_productivity_daily`
+PARTITION BY date
+CLUSTER BY email_editor, segment
+AS
+WITH nota_editor AS (
+    SELECT
+        note_id,
+        email_editor,
+        email_editor_lower,
+        ANY_VALUE(segment) AS segment,
+        MIN(IF(action_type = 'CREATE', DATE(event_timestamp), NULL)) AS fecha_create,
+        MIN(IF(action_type = 'FIRST_PUBLISH', DATE(event_timestamp), NULL)) AS fecha_publish,
+        MIN(DATE(event_timestamp)) AS fecha_primera,
+        ANY_VALUE(story_url) AS story_url
+    FROM `data-prod-454014.Silver.arc_editorial_activity`
+    WHERE action_type IN ('CREATE', 'FIRST_PUBLISH')
+      AND event_timestamp >= TIMESTAMP('2000-01-01')
+      AND email_editor IS NOT NULL AND email_editor != ''
+      AND email_editor_lower != 'infobae'
+    GROUP BY note_id, email_editor, email_editor_lower
+),
+notas_dia AS (
+    SELECT
+        ev.fecha AS date,
+        email_editor,
+        email_editor_lower,
+        segment,
+        COUNTIF(ev.tipo = 'created') AS notas_creadas,
+        COUNTIF(ev.tipo = 'published') AS notas_publicadas,
+        COUNTIF(ev.tipo = 'participated') AS notas_participadas
+    FROM nota_editor,
+         UNNEST([STRUCT('created' AS tipo, fecha_create AS fecha),
+                 STRUCT('published', fecha_publish),
+                 STRUCT('participated', fecha_primera)]) ev
+    WHERE ev.fecha IS NOT NULL
+    GROUP BY 1, 2, 3, 4
+),
+urls_editor AS (
+    SELECT
+        email_editor,
+        email_editor_lower,
+        segment,
+        story_url,
+        LOGICAL_OR(fecha_create IS NOT NULL) AS es_creador,
+        LOGICAL_OR(fecha_publish IS NOT NULL) AS es_publicador
+    FROM nota_editor
+    WHERE story_url IS NOT NULL
+    GROUP BY 1, 2, 3, 4
+),
+trafico_dia AS (
+    SELECT
+        t.date,
+        u.email_editor,
+        u.email_editor_lower,
+        u.segment,
+        SUM(IF(u.es_creador, t.visits, 0)) AS visits_creadas,
+        SUM(IF(u.es_creador, t.scrolls, 0)) AS scrolls_creadas,
+        SUM(IF(u.es_publicador, t.visits, 0)) AS visits_publicadas,
+        SUM(IF(u.es_publicador, t.scrolls, 0)) AS scrolls_publicadas,
+        SUM(t.visits) AS visits_participadas,
+        SUM(t.scrolls) AS scrolls_participadas
+    FROM urls_editor u
+    INNER JOIN `data-prod-454014.Silver.mv_story_traffic_daily` t
+        ON t.article_url = u.story_url
+    GROUP BY 1, 2, 3, 4
+)
+SELECT
+    COALESCE(n.date, t.date) AS date,
+    COALESCE(n.email_editor, t.email_editor) AS email_editor,
+    COALESCE(n.email_editor_lower, t.email_editor_lower) AS email_editor_lower,
+    COALESCE(n.segment, t.segment) AS segment,
+    IFNULL(n.notas_creadas, 0) AS notas_creadas,
+    IFNULL(n.notas_publicadas, 0) AS notas_publicadas,
+    IFNULL(n.notas_participadas, 0) AS notas_participadas,
+    IFNULL(t.visits_creadas, 0) AS visits_creadas,
+    IFNULL(t.scrolls_creadas, 0) AS scrolls_creadas,
+    IFNULL(t.visits_publicadas, 0) AS visits_publicadas,
+    IFNULL(t.scrolls_publicadas, 0) AS scrolls_publicadas,
+    IFNULL(t.visits_participadas, 0) AS visits_participadas,
+    IFNULL(t.scrolls_participadas, 0) AS scrolls_participadas
+FROM notas_dia n
+FULL OUTER JOIN trafico_dia t
+    ON n.date = t.date
+    AND n.email_editor_lower = t.email_editor_lower
+    AND COALESCE(n.segment, '') = COALESCE(t.segment, '');
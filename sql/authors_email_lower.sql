@@ -0,0 +1,16 @@
+-- Agrega email_lower y country_upper precomputados a la tabla de autores y
+-- la clusteriza por email_lower (correr una sola vez).
+--
+-- Todos los joins del dashboard normalizaban con LOWER() en ambos lados de
+-- la condición, lo que impide que BigQuery use el clustering y engorda el
+-- lado build del hash join. Con la columna ya normalizada, el join es por
+-- igualdad directa y el clustering sí poda bloques.
+--
+-- arc_editorial_activity recibe su email_editor_lower equivalente en
+-- sql/editorial_partitioning.sql.
+
+CREATE OR REPLACE TABLE `data-prod-454014.Bronze.authors_infobae_raw`
+CLUSTER BY email_lower
+AS
+SELECT *, LOWER(email) AS email_lower, UPPER(country) AS country_upper
+FROM `data-prod-454014.Bronze.authors_infobae_raw`;
@@ -0,0 +1,36 @@
+-- Tabla precomputada de roles por nota: quién la creó, quién la publicó y
+-- quién hizo el primer SAVE. Se regenera a diario vía scheduled query,
+-- junto con user_notes_daily (después de la carga de arc_editorial_activity).
+--
+-- Estaba pensada como materialized view, pero las MV de BigQuery no admiten
+-- ARRAY_AGG(... ORDER BY ... LIMIT 1), así que se refresca como tabla.
+--
+-- Reemplaza los bloques creadores_create / primer_save_all /
+-- creadores_primer_save que cada loader recomputaba escaneando
+-- arc_editorial_activity completa en cada request del dashboard.
+
+CREATE OR REPLACE TABLE `data-prod-454014.Silver.editorial_note_roles`
+CLUSTER BY note_id
+AS
+SELECT
+    note_id,
+    LOGICAL_OR(action_type = 'CREATE') AS has_create,
+    MAX(IF(action_type = 'CREATE', email_editor, NULL)) AS creator_email,
+    MAX(IF(action_type = 'FIRST_PUBLISH', email_editor, NULL)) AS publisher_email,
+    ARRAY_AGG(IF(action_type = 'SAVE', email_editor, NULL) IGNORE NULLS
+              ORDER BY event_timestamp LIMIT 1)[SAFE_OFFSET(0)] AS primer_save_email,
+    -- Creador "real" con la misma regla del dashboard: CREATE si existe,
+    -- si no el autor del primer SAVE
+    COALESCE(
+        MAX(IF(action_type = 'CREATE', email_editor, NULL)),
+        ARRAY_AGG(IF(action_type = 'SAVE', email_editor, NULL) IGNORE NULLS
+                  ORDER BY event_timestamp LIMIT 1)[SAFE_OFFSET(0)]
+    ) AS creador_email,
+    MIN(IF(action_type = 'FIRST_PUBLISH', DATE(event_timestamp), NULL)) AS publish_date,
+    MAX(story_url) AS story_url,
+    MAX(IF(action_type = 'FIRST_PUBLISH', segment, NULL)) AS segment
+FROM `data-prod-454014.Silver.arc_editorial_activity`
+-- Guarda trivial para satisfacer require_partition_filter (el scan es
+-- deliberadamente sobre todo el historial)
+WHERE event_timestamp >= TIMESTAMP('2000-01-01')
+GROUP BY note_id;
@@ -0,0 +1,32 @@
+-- Rollup diario de tráfico por (fecha, fecha de publicación, sección, país).
+-- Se regenera a diario vía scheduled query, junto con user_notes_daily.
+--
+-- La evolución diaria del dashboard se consulta con muchas combinaciones de
+-- (sección, país) por sesión; agregarlas sobre este rollup (miles de filas)
+-- en vez de la tabla Gold a granularidad de URL reduce scan y shuffle en
+-- órdenes de magnitud. Se conserva publish_date porque el dashboard filtra
+-- por ventana de publicación además de la ventana de tráfico.
+
+CREATE OR REPLACE TABLE `data-prod-454014.Gold.fact_daily_metric`
+PARTITION BY date
+CLUSTER BY section, country
+AS
+WITH usuarios_url AS (
+    SELECT article_url, event_date, SUM(daily_users) AS daily_users
+    FROM `data-prod-454014.Silver.GA4_productivity_cleaned`
+    GROUP BY article_url, event_date
+)
+SELECT
+    g.date,
+    DATE(g.publish_date) AS publish_date,
+    g.section,
+    a.country_upper AS country,
+    SUM(g.visits) AS visits,
+    SUM(g.pageviews) AS pageviews,
+    SUM(g.scrolls) AS scrolls,
+    SUM(u.daily_users) AS daily_users
+FROM `data-prod-454014.Gold.GA4_ARC_author_productivity_daily` g
+LEFT JOIN usuarios_url u ON u.article_url = g.article_url AND u.event_date = g.date
+LEFT JOIN `data-prod-454014.Bronze.authors_infobae_raw` a
+    ON LOWER(g.creator_email) = a.email_lower
+GROUP BY 1, 2, 3, 4;
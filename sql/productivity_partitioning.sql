@@ -0,0 +1,18 @@
+-- Particionado + clustering de las tablas de tráfico (correr una sola vez).
+-- El equivalente para arc_editorial_activity está en editorial_partitioning.sql.
+--
+-- Todas las queries del dashboard filtran por rango de fechas y joinean por
+-- article_url; particionar por día y clusterizar por URL limita cada scan a
+-- las particiones del período y poda los bloques de URLs no pedidas.
+
+CREATE OR REPLACE TABLE `data-prod-454014.Gold.GA4_ARC_author_productivity_daily`
+PARTITION BY date
+CLUSTER BY article_url
+AS
+SELECT * FROM `data-prod-454014.Gold.GA4_ARC_author_productivity_daily`;
+
+CREATE OR REPLACE TABLE `data-prod-454014.Silver.GA4_productivity_cleaned`
+PARTITION BY event_date
+CLUSTER BY article_url
+AS
+SELECT * FROM `data-prod-454014.Silver.GA4_productivity_cleaned`;
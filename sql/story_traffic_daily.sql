@@ -0,0 +1,21 @@
+-- Rollup diario de tráfico por URL (correr una sola vez; BigQuery lo
+-- mantiene incremental al ser materialized view).
+--
+-- Varias queries del dashboard joinean el set de URLs de un usuario contra
+-- la tabla Gold para sumar visitas/pageviews/scrolls. La Gold tiene varias
+-- filas por (URL, día); este rollup las colapsa a una sola, reduciendo
+-- bytes escaneados y shuffle en cada join por story_url.
+
+CREATE MATERIALIZED VIEW `data-prod-454014.Silver.mv_story_traffic_daily`
+PARTITION BY date
+CLUSTER BY article_url
+OPTIONS (enable_refresh = TRUE, refresh_interval_minutes = 60)
+AS
+SELECT
+    article_url,
+    date,
+    SUM(visits) AS visits,
+    SUM(pageviews) AS pageviews,
+    SUM(scrolls) AS scrolls
+FROM `data-prod-454014.Gold.GA4_ARC_author_productivity_daily`
+GROUP BY article_url, date;
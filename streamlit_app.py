@@ -4,13 +4,32 @@ Dashboard Optimizado para Productividad e Impacto Editorial
 Arquitectura: Queries Agregadas en BigQuery (NO descarga DataFrames grandes)
 """
 
+import functools
+import hashlib
+import threading
+
+import diskcache
+import numpy as np
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from google.api_core import exceptions as gcp_exceptions
+from google.api_core import retry as gcp_retry
 from google.cloud import bigquery
 from google.oauth2 import service_account
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# orjson serializa los payloads JSON de Plotly mucho más rápido que stdlib json;
+# cada rerun re-serializa todas las figuras, así que el ahorro es por interacción
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = "orjson"
+except ImportError:
+    pass
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONFIGURACIÓN GLOBAL
@@ -36,12 +55,40 @@ TABLE_PRODUCTIVITY_SILVER = "data-prod-454014.Silver.GA4_productivity_cleaned"
 TABLE_GEO_SOURCES = "data-prod-454014.Silver.GA4_geo_sources_metrics"
 TABLE_EDITORIAL = "data-prod-454014.Silver.arc_editorial_activity"
 TABLE_AUTHORS = "data-prod-454014.Bronze.authors_infobae_raw"
+TABLE_USER_NOTES = "data-prod-454014.Silver.user_notes_daily"
+TABLE_NOTE_ROLES = "data-prod-454014.Silver.editorial_note_roles"  # ver sql/user_notes_daily.sql
+TABLE_FACT_DAILY = "data-prod-454014.Gold.fact_daily_metric"  # ver sql/fact_daily_metric.sql
+TABLE_GEO_MONTHLY = "data-prod-454014.Silver.mv_geo_sources_by_url_month"  # ver sql/geo_sources_monthly.sql
+TABLE_STORY_TRAFFIC = "data-prod-454014.Silver.mv_story_traffic_daily"  # ver sql/story_traffic_daily.sql
+TABLE_AUTHOR_DAILY = "data-prod-454014.Gold.author_productivity_daily"  # ver sql/author_productivity_daily.sql
+DATASET_TMP = "data-prod-454014.tmp"  # tablas de scratch con expiración automática
+
+# Lookups de presentación (a nivel módulo para construirlos una sola vez)
+PAIS_FLAGS = {'ARGENTINA': '🇦🇷', 'COLOMBIA': '🇨🇴', 'PERU': '🇵🇪', 'ESPAÑA': '🇪🇸', 'MEXICO': '🇲🇽', 'AMERICA': 'AM'}
+COUNTRY_TRANSLATIONS = {
+    'Argentina': 'Argentina', 'Mexico': 'México', 'Colombia': 'Colombia', 'Spain': 'España',
+    'United States': 'Estados Unidos', 'Peru': 'Perú', 'Chile': 'Chile', 'Ecuador': 'Ecuador',
+    'Venezuela': 'Venezuela', 'Bolivia': 'Bolivia', 'Uruguay': 'Uruguay', 'Paraguay': 'Paraguay',
+    'Guatemala': 'Guatemala', 'Cuba': 'Cuba', 'Dominican Republic': 'República Dominicana',
+    'Honduras': 'Honduras', 'El Salvador': 'El Salvador', 'Nicaragua': 'Nicaragua',
+    'Costa Rica': 'Costa Rica', 'Panama': 'Panamá', 'Puerto Rico': 'Puerto Rico',
+    'Brazil': 'Brasil', 'Germany': 'Alemania', 'France': 'Francia', 'Italy': 'Italia',
+    'United Kingdom': 'Reino Unido', 'Canada': 'Canadá', 'Australia': 'Australia',
+    'Japan': 'Japón', 'China': 'China', 'India': 'India', 'Russia': 'Rusia',
+    'Portugal': 'Portugal', 'Netherlands': 'Países Bajos', 'Belgium': 'Bélgica',
+    'Switzerland': 'Suiza', 'Sweden': 'Suecia', 'Norway': 'Noruega', 'Denmark': 'Dinamarca',
+    'Poland': 'Polonia', 'Austria': 'Austria', 'Ireland': 'Irlanda', 'Israel': 'Israel',
+    '(not set)': 'No especificado'
+}
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CSS PERSONALIZADO
 # ═══════════════════════════════════════════════════════════════════════════════
 
-st.markdown(f"""
+@st.cache_resource
+def _build_css() -> str:
+    """Construye el bloque CSS una sola vez; el f-string no se re-evalúa por rerun."""
+    return f"""
 <style>
     .stApp {{ background-color: {FONDO_CLARO}; }}
     h1, h2, h3 {{ color: {NEGRO_PERIODISTICO} !important; font-family: 'Helvetica Neue', Arial, sans-serif; font-weight: 700; }}
@@ -60,18 +107,21 @@ st.markdown(f"""
     .kpi-delta {{ font-size: 0.85rem; margin-top: 5px; font-weight: 600; }}
     .kpi-delta.positive {{ color: #10B981; }}
     .kpi-delta.negative {{ color: #EF4444; }}
-    .section-title {{ font-size: 1.1rem; font-weight: 700; color: {NEGRO_PERIODISTICO}; margin-bottom: 15px; display: flex; align-items: center; gap: 8px; }}
+    .section-title {{ font-size: 1.1rem; font-weight: 700; color: {NEGRO_PERIODISTICO}; margin-bottom: 15px; display: flex; align-items: center; gap: 8px;
+                      border-top: 2px solid; border-image: linear-gradient(90deg, {NARANJA_INFOBAE} 0%, transparent 100%) 1; padding-top: 30px; margin-top: 30px; }}
     .section-title::before {{ content: ''; width: 4px; height: 20px; background: {NARANJA_INFOBAE}; border-radius: 2px; }}
     section[data-testid="stSidebar"] {{ background-color: {BLANCO}; border-right: 1px solid #E5E7EB; }}
     section[data-testid="stSidebar"] .stMarkdown h3 {{ color: {NARANJA_INFOBAE} !important; font-size: 0.9rem !important; text-transform: uppercase; letter-spacing: 1px; }}
     .status-badge {{ display: inline-block; padding: 4px 12px; border-radius: 20px; font-size: 0.75rem; font-weight: 600; }}
     .status-connected {{ background: #D1FAE5; color: #065F46; }}
     .status-error {{ background: #FEE2E2; color: #991B1B; }}
-    .divider {{ height: 2px; background: linear-gradient(90deg, {NARANJA_INFOBAE} 0%, transparent 100%); margin: 30px 0; }}
     #MainMenu {{visibility: hidden;}}
     footer {{visibility: hidden;}}
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+st.markdown(_build_css(), unsafe_allow_html=True)
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONEXIÓN BIGQUERY
@@ -91,947 +141,1000 @@ def get_bigquery_client():
         st.error(f"Error de conexión: {e}")
         return None
 
+
+@st.cache_resource
+def get_bqstorage_client():
+    """
+    Cliente del BigQuery Storage Read API, compartido entre sesiones.
+
+    Usa un canal gRPC con keepalive para que las descargas concurrentes
+    multiplexen sobre conexiones ya calientes en lugar de pagar TLS + HTTP/2
+    en cada query. Se pasa como bqstorage_client a .to_dataframe()/.to_arrow()
+    en los resultados multi-fila. Devuelve None si la librería no está
+    instalada o no hay credenciales (los fetch caen al path REST).
+    """
+    try:
+        from google.cloud.bigquery_storage import BigQueryReadClient
+        from google.cloud.bigquery_storage_v1.services.big_query_read.transports import (
+            BigQueryReadGrpcTransport,
+        )
+    except ImportError:
+        return None
+    try:
+        if "gcp_service_account" not in st.secrets:
+            return None
+        credentials = service_account.Credentials.from_service_account_info(
+            dict(st.secrets["gcp_service_account"])
+        )
+        channel = BigQueryReadGrpcTransport.create_channel(
+            credentials=credentials,
+            options=[
+                ("grpc.keepalive_time_ms", 60000),
+                ("grpc.keepalive_timeout_ms", 10000),
+            ],
+        )
+        return BigQueryReadClient(transport=BigQueryReadGrpcTransport(channel=channel))
+    except Exception:
+        return None
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # QUERIES OPTIMIZADAS - LÓGICA DUAL DE FECHAS
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def get_user_notes_cte(email_filter: str, start_date: str, end_date: str, include_urls: bool = False) -> str:
+# Reintentos con backoff exponencial para errores transitorios de BigQuery
+# (429 rateLimitExceeded, 500/503). Sin esto, un error pasajero deja KPIs en
+# cero atrapados 1 hora en st.cache_data y el dashboard parece roto.
+_BQ_RETRY = gcp_retry.Retry(
+    predicate=gcp_retry.if_transient_error,
+    initial=1.0, maximum=8.0, multiplier=2, deadline=30,
+)
+
+
+def _infer_bq_type(value) -> str:
+    """Mapea un valor Python al tipo escalar de BigQuery correspondiente."""
+    if isinstance(value, bool):
+        return "BOOL"
+    if isinstance(value, int):
+        return "INT64"
+    if isinstance(value, float):
+        return "FLOAT64"
+    return "STRING"
+
+
+def _q(client, sql: str, **params):
     """
-    Genera las CTEs para identificar las notas "del usuario".
-    Un usuario es dueño de una nota si:
-    1. La CREÓ (evento CREATE)
-    2. La PUBLICÓ (evento FIRST_PUBLISH)
-    3. Fue el PRIMERO en hacer SAVE (si no hay CREATE de nadie)
-    
-    Returns: String con las CTEs (sin WITH inicial, para poder encadenar)
+    Lanza una query parametrizada (@nombre en el SQL) con el cache de
+    resultados de BigQuery habilitado. Al mantener el texto SQL estable y
+    pasar los filtros como parámetros, queries idénticas reutilizan el cache
+    de 24hs entre usuarios y se elimina la inyección vía strings.
     """
-    url_field = ", story_url" if include_urls else ""
-    url_select = f", e.story_url" if include_urls else ""
-    url_ps_select = f", ps.story_url" if include_urls else ""
-    
-    return f"""
-        notas_create_{email_filter.replace('@', '_').replace('.', '_')[:10]} AS (
-            SELECT DISTINCT note_id{url_select} FROM `{TABLE_EDITORIAL}` e
-            WHERE email_editor = '{email_filter}'
-              AND action_type = 'CREATE'
-              AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-              {"AND story_url IS NOT NULL" if include_urls else ""}
-        ),
-        notas_publish_{email_filter.replace('@', '_').replace('.', '_')[:10]} AS (
-            SELECT DISTINCT note_id{url_select} FROM `{TABLE_EDITORIAL}` e
-            WHERE email_editor = '{email_filter}'
-              AND action_type = 'FIRST_PUBLISH'
-              AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-              {"AND story_url IS NOT NULL" if include_urls else ""}
-        ),
-        primer_save_{email_filter.replace('@', '_').replace('.', '_')[:10]} AS (
-            SELECT note_id, email_editor{", story_url" if include_urls else ""},
-                   ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-            FROM `{TABLE_EDITORIAL}`
-            WHERE action_type = 'SAVE'
-              AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-              {"AND story_url IS NOT NULL" if include_urls else ""}
-        ),
-        notas_con_create AS (
-            SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'
-        ),
-        notas_primer_save_{email_filter.replace('@', '_').replace('.', '_')[:10]} AS (
-            SELECT ps.note_id{url_ps_select} FROM primer_save_{email_filter.replace('@', '_').replace('.', '_')[:10]} ps
-            WHERE ps.rn = 1 
-              AND ps.email_editor = '{email_filter}'
-              AND ps.note_id NOT IN (SELECT note_id FROM notas_con_create)
-        ),
-        todas_notas_usuario AS (
-            SELECT note_id{url_field} FROM notas_create_{email_filter.replace('@', '_').replace('.', '_')[:10]} UNION DISTINCT
-            SELECT note_id{url_field} FROM notas_publish_{email_filter.replace('@', '_').replace('.', '_')[:10]} UNION DISTINCT
-            SELECT note_id{url_field} FROM notas_primer_save_{email_filter.replace('@', '_').replace('.', '_')[:10]}
-        ),
-        notas_publicadas_periodo AS (
-            SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-            WHERE action_type = 'FIRST_PUBLISH'
-              AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=_bq_params(params),
+        use_query_cache=True,
+    )
+    return client.query(sql, job_config=job_config, retry=_BQ_RETRY)
+
+
+def _bq_params(params: dict) -> list:
+    """Convierte un dict de filtros en parámetros escalares de BigQuery."""
+    return [
+        bigquery.ScalarQueryParameter(name, _infer_bq_type(value), value)
+        for name, value in params.items()
+    ]
+
+
+def _params_for(query: str, **candidates) -> dict:
+    """
+    Se queda solo con los filtros que la query realmente referencia como
+    @parámetro. Permite armar un único dict de candidatos en loaders cuyas
+    ramas usan distintos subconjuntos de filtros.
+    """
+    return {
+        name: value for name, value in candidates.items()
+        if value is not None and f"@{name}" in query
+    }
+
+
+# Presupuesto de scan para queries globales (sin filtro de email). Por encima
+# de esto conviene degradar a una query más acotada antes que pagar por byte.
+_MAX_SCAN_BYTES = 5 * 1024 ** 3  # 5 GB
+
+
+def estimate_bytes(client, sql: str, **params) -> int:
+    """
+    Dry run: devuelve cuántos bytes escanearía la query sin ejecutarla.
+    No cuesta nada en BigQuery y responde en milisegundos.
+    """
+    job_config = bigquery.QueryJobConfig(
+        dry_run=True,
+        use_query_cache=False,
+        query_parameters=_bq_params(params),
+    )
+    return client.query(sql, job_config=job_config).total_bytes_processed
+
+
+def _rows(client, query: str, **params):
+    """
+    Ejecuta una query y espera el resultado. Con clientes >=3.14 usa
+    query_and_wait, que resuelve insert + espera + primera página en UN solo
+    RPC (jobs.query); para jobs chicos o cacheados elimina el polling de
+    ~750ms que dominaba el tiempo de pared.
+    """
+    if hasattr(client, "query_and_wait"):
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=_bq_params(params),
+            use_query_cache=True,
         )
+        return client.query_and_wait(query, job_config=job_config,
+                                     wait_timeout=60, retry=_BQ_RETRY)
+    return _q(client, query, **params).result(retry=_BQ_RETRY)
+
+
+def _scalar_row(client, query: str, **params):
+    """
+    Ejecuta una query que devuelve una sola fila y retorna el Row directamente
+    (o None si no hay resultados), sin pasar por pandas/pyarrow.
+    """
+    return next(iter(_rows(client, query, **params)), None)
+
+
+def _df(client, query: str, dtypes: dict = None, **params) -> pd.DataFrame:
+    """
+    Descarga un resultado multi-fila como DataFrame vía el Storage Read API
+    (stream Arrow, decodifica mucho más rápido que la paginación REST).
+    Si el cliente de Storage no está disponible cae al path REST.
+
+    dtypes permite fijar el tipo final de columnas que se saben no-nulas
+    (contadores), evitando la segunda pasada de downcast en pandas.
+    """
+    rows = _rows(client, query, **params)
+    kwargs = {'dtypes': dtypes} if dtypes else {}
+    bqstorage = get_bqstorage_client()
+    if bqstorage is not None:
+        return rows.to_dataframe(bqstorage_client=bqstorage, create_bqstorage_client=False, **kwargs)
+    return rows.to_dataframe(**kwargs)
+
+
+def _parallel_fetch(tasks: dict) -> dict:
+    """
+    Ejecuta loaders independientes en paralelo y devuelve {nombre: resultado}.
+    La espera total pasa de sum(queries) a max(queries). Cada worker hereda el
+    ScriptRunContext del hilo principal para que st.cache_data y los st.error
+    internos se comporten igual que en la ejecución secuencial.
+    """
+    ctx = get_script_run_ctx()
+
+    def _run(fn, args):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
+
+    with ThreadPoolExecutor(max_workers=len(tasks)) as ex:
+        futures = {name: ex.submit(_run, fn, args) for name, (fn, *args) in tasks.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+# Caché en disco compartida entre los workers del deployment. st.cache_data
+# guarda copias por proceso: con varios workers, el primer render de cada uno
+# repetía las mismas queries que otro worker acababa de pagar. Este segundo
+# nivel sobrevive restarts y se comparte vía /tmp.
+_DISK_CACHE = diskcache.Cache('/tmp/bq_cache', size_limit=2 ** 31)
+
+
+def persistent_cache(ttl: int = 3600):
+    """
+    Segundo nivel de caché (disco) debajo de st.cache_data: las llamadas del
+    mismo proceso pegan en memoria, y las de otros workers o tras un restart
+    pegan en disco en vez de volver a BigQuery. Clavea por nombre de función
+    y argumentos (sin el cliente); diskcache se ocupa de expiración y pickle.
     """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(_client, *args, **kwargs):
+            key_src = repr((fn.__name__, args, sorted(kwargs.items())))
+            key = hashlib.blake2b(key_src.encode(), digest_size=16).hexdigest()
+            try:
+                cached = _DISK_CACHE.get(key)
+            except Exception:
+                cached = None
+            if cached is not None:
+                return cached
+            result = fn(_client, *args, **kwargs)
+            try:
+                _DISK_CACHE.set(key, result, expire=ttl)
+            except Exception:
+                pass  # un disco lleno o no escribible no debe romper el render
+            return result
+        return wrapper
+    return decorator
+
+
+# SQL estático compilado UNA vez a nivel de módulo. El texto no cambia entre
+# reruns (los filtros viajan como @parámetros), así que además de no rearmar
+# f-strings de varios KB por llamada, la query idéntica pega en el cache de
+# resultados de BigQuery entre usuarios.
+_SQL_MATERIALIZE_USER_NOTES = f"""
+    CREATE OR REPLACE TABLE `{{table_name}}`
+    OPTIONS (expiration_timestamp = TIMESTAMP_ADD(CURRENT_TIMESTAMP(), INTERVAL 1 HOUR))
+    AS
+    SELECT
+        n.note_id,
+        ANY_VALUE(n.story_url) as story_url,
+        LOGICAL_OR(p.note_id IS NOT NULL) as is_published
+    FROM `{TABLE_USER_NOTES}` n
+    LEFT JOIN (
+        SELECT DISTINCT note_id FROM `{TABLE_USER_NOTES}`
+        WHERE is_publisher
+          AND event_date BETWEEN DATE(@start_date) AND DATE(@end_date)
+    ) p ON n.note_id = p.note_id
+    WHERE n.email_editor = @email
+      AND n.event_date BETWEEN DATE(@start_date) AND DATE(@end_date)
+    GROUP BY n.note_id
+"""
+
+# Opciones de los tres filtros (emails con nombre, secciones y países) en una
+# sola query etiquetada por tipo; el scan de editores se comparte vía CTE
+_SQL_FILTER_OPTIONS = f"""
+    WITH editores AS (
+        -- APPROX_TOP_COUNT evita el shuffle global del DISTINCT exacto:
+        -- es exacto mientras haya menos de 5000 editores distintos en la
+        -- ventana, que cubre de sobra el tamaño real del dropdown
+        SELECT t.value as email_editor, LOWER(t.value) as email_editor_lower
+        FROM (
+            SELECT APPROX_TOP_COUNT(email_editor, 5000) as tops
+            FROM `{TABLE_EDITORIAL}`
+            WHERE action_type IN ('CREATE', 'FIRST_PUBLISH')
+              AND event_timestamp >= TIMESTAMP(@start_date) AND event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
+              AND email_editor IS NOT NULL AND email_editor != ''
+        ), UNNEST(tops) t
+    )
+    SELECT 'email' as tipo, e.email_editor as valor,
+           COALESCE(a.complete_name, e.email_editor) as etiqueta
+    FROM editores e
+    LEFT JOIN `{TABLE_AUTHORS}` a ON e.email_editor_lower = a.email_lower
+    UNION ALL
+    SELECT DISTINCT 'seccion', segment, segment
+    FROM `{TABLE_EDITORIAL}`
+    WHERE action_type = 'FIRST_PUBLISH'
+      AND event_timestamp >= TIMESTAMP(@start_date) AND event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
+      AND segment IS NOT NULL AND segment != ''
+    UNION ALL
+    SELECT DISTINCT 'pais', a.country, a.country
+    FROM `{TABLE_AUTHORS}` a
+    INNER JOIN editores e ON a.email_lower = e.email_editor_lower
+    WHERE a.country IS NOT NULL AND a.country != ''
+"""
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
-def load_production_metrics(_client, start_date: str, end_date: str, email_filter: str = None, seccion_filter: str = None, pais_filter: str = None) -> dict:
+def materialize_user_notes(_client, email_filter: str, start_date: str, end_date: str) -> str:
     """
-    Carga métricas de PRODUCCIÓN desde arc_editorial_activity.
-    
+    Materializa UNA sola vez el set de notas del usuario para un
+    (email, rango de fechas) en una tabla de scratch con expiración de 1 hora,
+    y devuelve su nombre calificado.
+
+    Las queries posteriores referencian esa tabla plana (note_id, story_url,
+    is_published) en lugar de recompilar y re-escanear las CTEs de atribución
+    en cada función.
+    """
+    # Digest del email completo: un prefijo truncado del email colisionaría
+    # entre direcciones parecidas y mezclaría resultados de dos usuarios
+    key = hashlib.blake2b(f"{email_filter}|{start_date}|{end_date}".encode(), digest_size=8).hexdigest()
+    table_name = f"{DATASET_TMP}.user_notes_{key}"
+
+    query = _SQL_MATERIALIZE_USER_NOTES.format(table_name=table_name)
+    _q(_client, query, email=email_filter, start_date=start_date, end_date=end_date).result()
+    return table_name
+
+
+def load_all_kpis_sql(start_date: str, end_date: str, email_filter: str = None, seccion_filter: str = None, pais_filter: str = None, user_notes_table: str = None) -> str:
+    """
+    Construye UNA sola query que devuelve todos los contadores de producción
+    (arc_editorial_activity) y de tráfico (GA4) en una única fila.
+
+    Las CTEs de "notas del usuario" se definen una sola vez y se comparten entre
+    los contadores, de modo que BigQuery resuelve todo en un solo job en lugar
+    de 5 round-trips independientes.
+
     Definición de "creador":
     - Tiene evento CREATE, O
     - Fue el PRIMERO en hacer SAVE en notas que no tienen CREATE de nadie
-    
+
     Definición de "publicador":
     - Tiene evento FIRST_PUBLISH
-    
+
     Notas "del usuario" = CREATE + FIRST_PUBLISH + PRIMER_SAVE (si no hay CREATE)
-    Notas "publicadas" = notas "del usuario" que tienen FIRST_PUBLISH
     """
-    seccion_clause = f"AND e.segment = '{seccion_filter}'" if seccion_filter else ""
-    pais_clause = f"AND UPPER(a.country) = UPPER('{pais_filter}')" if pais_filter else ""
-    join_clause = f"LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(e.email_editor) = LOWER(a.email)" if pais_filter else ""
-    
-    creadores = 0
-    publicadores = 0
-    notas = 0
-    
-    if email_filter:
-        # Query para contar creadores y publicadores de las notas del usuario
-        query_counts = f"""
-            WITH notas_create AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}'
-                  AND action_type = 'CREATE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            notas_publish AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}'
-                  AND action_type = 'FIRST_PUBLISH'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            primer_save AS (
-                SELECT note_id, email_editor,
-                       ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                FROM `{TABLE_EDITORIAL}`
-                WHERE action_type = 'SAVE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            notas_con_create AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'
-            ),
-            notas_primer_save AS (
-                SELECT ps.note_id FROM primer_save ps
-                WHERE ps.rn = 1 
-                  AND ps.email_editor = '{email_filter}'
-                  AND ps.note_id NOT IN (SELECT note_id FROM notas_con_create)
-            ),
-            todas_notas_usuario AS (
-                SELECT note_id FROM notas_create UNION DISTINCT
-                SELECT note_id FROM notas_publish UNION DISTINCT
-                SELECT note_id FROM notas_primer_save
+    TABLE_SILVER = "data-prod-454014.Silver.GA4_productivity_cleaned"
+
+    seccion_clause_editorial = f"AND e.segment = @seccion" if seccion_filter else ""
+    seccion_clause_gold = f"AND g.section = @seccion" if seccion_filter else ""
+    # El filtro de país se materializa una vez como CTE pre-filtrada y se aplica
+    # con INNER JOIN, en lugar de LEFT JOIN + predicado en el WHERE externo que
+    # el optimizador no siempre empuja hacia el scan
+    pais_cte = (
+        f"""authors_in_country AS (
+                SELECT email_lower as email FROM `{TABLE_AUTHORS}`
+                WHERE country_upper = @pais
             ),
-            -- Creadores reales: CREATE si existe, si no PRIMER_SAVE
-            creadores_create AS (
-                SELECT note_id, email_editor as creador_email FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'
+            """
+        if pais_filter else ""
+    )
+    join_editorial = "INNER JOIN authors_in_country a ON e.email_editor_lower = a.email" if pais_filter else ""
+    join_gold = "INNER JOIN authors_in_country a ON LOWER(g.creator_email) = a.email" if pais_filter else ""
+
+    if email_filter:
+        return f"""
+            WITH {pais_cte}todas_notas_usuario AS (
+                SELECT note_id, story_url FROM `{user_notes_table}`
             ),
-            primer_save_all AS (
-                SELECT note_id, email_editor, ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                FROM `{TABLE_EDITORIAL}` WHERE action_type = 'SAVE'
+            notas_publicadas AS (
+                SELECT note_id FROM `{user_notes_table}` WHERE is_published
             ),
-            creadores_primer_save AS (
-                SELECT ps.note_id, ps.email_editor as creador_email FROM primer_save_all ps
-                WHERE ps.rn = 1 AND ps.note_id NOT IN (SELECT note_id FROM creadores_create)
+            urls_del_usuario AS (
+                SELECT DISTINCT story_url FROM `{user_notes_table}`
+                WHERE is_published AND story_url IS NOT NULL
             ),
+            -- Roles precomputados a diario (ver sql/editorial_note_roles.sql):
+            -- creador real = CREATE si existe, si no el primer SAVE
             creadores_reales AS (
-                SELECT note_id, creador_email FROM creadores_create UNION ALL
-                SELECT note_id, creador_email FROM creadores_primer_save
+                SELECT note_id, creador_email FROM `{TABLE_NOTE_ROLES}`
             ),
             -- Publicadores de las notas del usuario
             publicadores_notas AS (
-                SELECT DISTINCT e.email_editor
+                SELECT e.email_editor
                 FROM `{TABLE_EDITORIAL}` e
                 WHERE e.action_type = 'FIRST_PUBLISH'
-                  AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
+                  AND e.event_timestamp >= TIMESTAMP(@start_date) AND e.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
                   AND e.note_id IN (SELECT note_id FROM todas_notas_usuario)
             ),
             -- Creadores de las notas del usuario
             creadores_notas AS (
-                SELECT DISTINCT cr.creador_email
+                SELECT cr.creador_email
                 FROM creadores_reales cr
                 WHERE cr.note_id IN (SELECT note_id FROM todas_notas_usuario)
-            )
-            SELECT 
-                (SELECT COUNT(*) FROM creadores_notas) as total_creadores,
-                (SELECT COUNT(*) FROM publicadores_notas) as total_publicadores
-        """
-        
-        try:
-            df_counts = _client.query(query_counts).to_dataframe()
-            if not df_counts.empty:
-                creadores = int(df_counts.iloc[0]['total_creadores'] or 0)
-                publicadores = int(df_counts.iloc[0]['total_publicadores'] or 0)
-        except:
-            pass
-        
-        # Query para notas publicadas del usuario
-        query_notas = f"""
-            WITH notas_create AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}'
-                  AND action_type = 'CREATE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            notas_publish AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}'
-                  AND action_type = 'FIRST_PUBLISH'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            primer_save AS (
-                SELECT note_id, email_editor,
-                       ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                FROM `{TABLE_EDITORIAL}`
-                WHERE action_type = 'SAVE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            notas_con_create AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'
             ),
-            notas_primer_save AS (
-                SELECT ps.note_id FROM primer_save ps
-                WHERE ps.rn = 1 
-                  AND ps.email_editor = '{email_filter}'
-                  AND ps.note_id NOT IN (SELECT note_id FROM notas_con_create)
-            ),
-            todas_notas_usuario AS (
-                SELECT note_id FROM notas_create UNION DISTINCT
-                SELECT note_id FROM notas_publish UNION DISTINCT
-                SELECT note_id FROM notas_primer_save
+            trafico AS (
+                SELECT
+                    IFNULL(SUM(g.visits), 0) as visitas_totales,
+                    IFNULL(SUM(g.pageviews), 0) as pageviews_totales,
+                    IFNULL(SAFE_DIVIDE(SUM(g.total_time_seconds), SUM(g.visits)), 0) as tiempo_promedio_segundos,
+                    IFNULL(SAFE_DIVIDE(SUM(g.scrolls), SUM(g.visits)), 0) as scroll_promedio,
+                    IFNULL(SUM(g.scrolls), 0) as scrolls_totales
+                FROM `{TABLE_PRODUCTIVITY}` g
+                INNER JOIN urls_del_usuario u ON u.story_url = g.article_url
+                {join_gold}
+                WHERE g.date BETWEEN DATE(@start_date) AND DATE(@end_date)
+                  {seccion_clause_gold}
             ),
-            notas_publicadas AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE action_type = 'FIRST_PUBLISH'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
+            usuarios AS (
+                SELECT IFNULL(SUM(s.daily_users), 0) as usuarios_unicos
+                FROM `{TABLE_SILVER}` s
+                INNER JOIN urls_del_usuario u ON u.story_url = s.article_url
+                WHERE s.event_date BETWEEN DATE(@start_date) AND DATE(@end_date)
             )
-            SELECT COUNT(DISTINCT t.note_id) as notas_publicadas
-            FROM todas_notas_usuario t
-            INNER JOIN notas_publicadas p ON t.note_id = p.note_id
-            INNER JOIN `{TABLE_EDITORIAL}` e ON t.note_id = e.note_id AND e.action_type = 'FIRST_PUBLISH'
-            {f"LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(e.email_editor) = LOWER(a.email)" if pais_filter else ""}
-            WHERE 1=1 {seccion_clause} {pais_clause}
-        """
-    else:
-        # Sin filtro de email: contar todos los creadores y publicadores únicos
-        query_creadores = f"""
-            SELECT COUNT(DISTINCT e.email_editor) as creadores_activos
-            FROM `{TABLE_EDITORIAL}` e
-            {join_clause}
-            WHERE e.action_type = 'CREATE'
-              AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-              {seccion_clause} {pais_clause}
-        """
-        query_publicadores = f"""
-            SELECT COUNT(DISTINCT e.email_editor) as publicadores_activos
-            FROM `{TABLE_EDITORIAL}` e
-            {join_clause}
-            WHERE e.action_type = 'FIRST_PUBLISH'
-              AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-              {seccion_clause} {pais_clause}
+            SELECT
+                (SELECT APPROX_COUNT_DISTINCT(creador_email) FROM creadores_notas) as total_creadores,
+                (SELECT APPROX_COUNT_DISTINCT(email_editor) FROM publicadores_notas) as total_publicadores,
+                (SELECT APPROX_COUNT_DISTINCT(t.note_id)
+                 FROM todas_notas_usuario t
+                 INNER JOIN notas_publicadas p ON t.note_id = p.note_id
+                 INNER JOIN `{TABLE_EDITORIAL}` e ON t.note_id = e.note_id AND e.action_type = 'FIRST_PUBLISH'
+                 {join_editorial}
+                 WHERE e.event_timestamp >= TIMESTAMP(@start_date)
+                   AND e.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
+                   {seccion_clause_editorial}) as notas_publicadas,
+                t.visitas_totales,
+                t.pageviews_totales,
+                t.tiempo_promedio_segundos,
+                t.scroll_promedio,
+                t.scrolls_totales,
+                u.usuarios_unicos
+            FROM trafico t
+            CROSS JOIN usuarios u
         """
-        query_notas = f"""
-            SELECT COUNT(DISTINCT e.note_id) as notas_publicadas
+
+    # Sin filtro de email: contadores globales con agregación condicional
+    return f"""
+        WITH {pais_cte}produccion AS (
+            SELECT
+                APPROX_COUNT_DISTINCT(IF(e.action_type = 'CREATE', e.email_editor, NULL)) as total_creadores,
+                APPROX_COUNT_DISTINCT(IF(e.action_type = 'FIRST_PUBLISH', e.email_editor, NULL)) as total_publicadores,
+                APPROX_COUNT_DISTINCT(IF(e.action_type = 'FIRST_PUBLISH', e.note_id, NULL)) as notas_publicadas
             FROM `{TABLE_EDITORIAL}` e
-            {join_clause}
-            WHERE e.action_type = 'FIRST_PUBLISH'
-              AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-              {seccion_clause} {pais_clause}
-        """
-        
-        try:
-            df_creadores = _client.query(query_creadores).to_dataframe()
-            if not df_creadores.empty:
-                creadores = int(df_creadores.iloc[0]['creadores_activos'] or 0)
-        except Exception as e:
-            st.error(f"Error cargando creadores activos: {e}")
-        
-        try:
-            df_publicadores = _client.query(query_publicadores).to_dataframe()
-            if not df_publicadores.empty:
-                publicadores = int(df_publicadores.iloc[0]['publicadores_activos'] or 0)
-        except Exception as e:
-            st.error(f"Error cargando publicadores activos: {e}")
-    
-    try:
-        df_notas = _client.query(query_notas).to_dataframe()
-        if not df_notas.empty:
-            notas = int(df_notas.iloc[0]['notas_publicadas'] or 0)
-    except Exception as e:
-        st.error(f"Error cargando notas publicadas: {e}")
-    
-    return {'creadores_activos': creadores, 'publicadores_activos': publicadores, 'notas_publicadas': notas}
+            {join_editorial}
+            WHERE e.action_type IN ('CREATE', 'FIRST_PUBLISH')
+              AND e.event_timestamp >= TIMESTAMP(@start_date) AND e.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
+              {seccion_clause_editorial}
+        ),
+        trafico AS (
+            SELECT
+                IFNULL(SUM(g.visits), 0) as visitas_totales,
+                IFNULL(SUM(g.pageviews), 0) as pageviews_totales,
+                IFNULL(SAFE_DIVIDE(SUM(g.total_time_seconds), SUM(g.visits)), 0) as tiempo_promedio_segundos,
+                IFNULL(SAFE_DIVIDE(SUM(g.scrolls), SUM(g.visits)), 0) as scroll_promedio,
+                IFNULL(SUM(g.scrolls), 0) as scrolls_totales
+            FROM `{TABLE_PRODUCTIVITY}` g
+            {join_gold}
+            WHERE g.date BETWEEN DATE(@start_date) AND DATE(@end_date)
+              AND DATE(g.publish_date) BETWEEN DATE(@start_date) AND DATE(@end_date)
+              {seccion_clause_gold}
+        ),
+        usuarios AS (
+            SELECT IFNULL(SUM(s.daily_users), 0) as usuarios_unicos
+            FROM `{TABLE_SILVER}` s
+            INNER JOIN `{TABLE_PRODUCTIVITY}` g ON s.article_url = g.article_url AND s.event_date = g.date
+            {join_gold}
+            WHERE s.event_date BETWEEN DATE(@start_date) AND DATE(@end_date)
+              AND DATE(g.publish_date) BETWEEN DATE(@start_date) AND DATE(@end_date)
+              {seccion_clause_gold}
+        )
+        SELECT
+            p.total_creadores,
+            p.total_publicadores,
+            p.notas_publicadas,
+            t.visitas_totales,
+            t.pageviews_totales,
+            t.tiempo_promedio_segundos,
+            t.scroll_promedio,
+            t.scrolls_totales,
+            u.usuarios_unicos
+        FROM produccion p
+        CROSS JOIN trafico t
+        CROSS JOIN usuarios u
+    """
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
-def load_traffic_metrics(_client, start_date: str, end_date: str, email_filter: str = None, seccion_filter: str = None, pais_filter: str = None) -> dict:
+def _load_kpis_window(_client, start_date: str, end_date: str, email_filter: str = None, seccion_filter: str = None, pais_filter: str = None) -> dict:
     """
-    Carga métricas de TRÁFICO desde GA4_ARC_author_productivity_daily.
-    
-    Con filtro de email:
-    - Busca notas "del usuario" (CREATE + FIRST_PUBLISH + PRIMER_SAVE sin CREATE)
-    - Solo las que están publicadas
-    - Calcula tráfico sobre esas notas
+    Carga métricas de producción (arc_editorial_activity) y tráfico (GA4)
+    de una ventana de fechas con un único job de BigQuery.
     """
-    TABLE_SILVER = "data-prod-454014.Silver.GA4_productivity_cleaned"
-    
-    seccion_clause = f"AND g.section = '{seccion_filter}'" if seccion_filter else ""
-    pais_clause = f"AND UPPER(a.country) = UPPER('{pais_filter}')" if pais_filter else ""
-    join_clause = f"LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(g.creator_email) = LOWER(a.email)" if pais_filter else ""
-    
     result = {
-        'visitas_totales': 0, 'pageviews_totales': 0, 
+        'creadores_activos': 0, 'publicadores_activos': 0, 'notas_publicadas': 0,
+        'visitas_totales': 0, 'usuarios_unicos': 0, 'pageviews_totales': 0,
         'tiempo_promedio_min': 0, 'scroll_promedio': 0, 'scrolls_totales': 0,
-        'usuarios_unicos': 0
+        'productividad': 0
     }
-    
+
+    user_notes_table = None
     if email_filter:
-        # Con filtro de email: usar CTEs para identificar notas del usuario
-        query = f"""
-            WITH notas_create AS (
-                SELECT DISTINCT note_id, story_url FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}'
-                  AND action_type = 'CREATE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                  AND story_url IS NOT NULL
-            ),
-            notas_publish AS (
-                SELECT DISTINCT note_id, story_url FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}'
-                  AND action_type = 'FIRST_PUBLISH'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                  AND story_url IS NOT NULL
-            ),
-            primer_save AS (
-                SELECT note_id, email_editor, story_url,
-                       ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                FROM `{TABLE_EDITORIAL}`
-                WHERE action_type = 'SAVE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                  AND story_url IS NOT NULL
-            ),
-            notas_con_create AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'
-            ),
-            notas_primer_save AS (
-                SELECT ps.note_id, ps.story_url FROM primer_save ps
-                WHERE ps.rn = 1 
-                  AND ps.email_editor = '{email_filter}'
-                  AND ps.note_id NOT IN (SELECT note_id FROM notas_con_create)
-            ),
-            todas_notas_usuario AS (
-                SELECT note_id, story_url FROM notas_create UNION DISTINCT
-                SELECT note_id, story_url FROM notas_publish UNION DISTINCT
-                SELECT note_id, story_url FROM notas_primer_save
-            ),
-            notas_publicadas AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE action_type = 'FIRST_PUBLISH'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
+        try:
+            user_notes_table = materialize_user_notes(_client, email_filter, start_date, end_date)
+        except Exception as e:
+            st.error(f"Error materializando notas del usuario: {e}")
+            return result
+
+    query = load_all_kpis_sql(start_date, end_date, email_filter, seccion_filter, pais_filter, user_notes_table)
+    params = {'start_date': start_date, 'end_date': end_date}
+    if seccion_filter:
+        params['seccion'] = seccion_filter
+    if pais_filter:
+        params['pais'] = pais_filter.upper()
+
+    try:
+        row = _scalar_row(_client, query, **params)
+    except Exception as e:
+        st.error(f"Error cargando KPIs: {e}")
+        return result
+
+    if row is None:
+        return result
+
+    # Los agregados vienen con IFNULL(..., 0) desde SQL: la fila nunca trae
+    # NULLs y no hace falta el guard "or 0" por columna
+    result['creadores_activos'] = int(row['total_creadores'])
+    result['publicadores_activos'] = int(row['total_publicadores'])
+    result['notas_publicadas'] = int(row['notas_publicadas'])
+    result['visitas_totales'] = int(row['visitas_totales'])
+    result['pageviews_totales'] = int(row['pageviews_totales'])
+    result['tiempo_promedio_min'] = float(row['tiempo_promedio_segundos']) / 60
+    result['scroll_promedio'] = float(row['scroll_promedio'])
+    result['scrolls_totales'] = int(row['scrolls_totales'])
+    result['usuarios_unicos'] = int(row['usuarios_unicos'])
+    result['productividad'] = result['visitas_totales'] / max(result['notas_publicadas'], 1)
+
+    return result
+
+
+def load_kpis_dual_sql(seccion_filter: str = None, pais_filter: str = None) -> str:
+    """
+    Variante global (sin filtro de email) de load_all_kpis_sql que agrega el
+    período actual y el anterior en un solo scan: cada contador se duplica con
+    IF() por ventana, y el WHERE acota el scan a la unión de ambos períodos.
+    Espera @start_date/@end_date (actual) y @prev_start/@prev_end (anterior).
+    """
+    TABLE_SILVER = "data-prod-454014.Silver.GA4_productivity_cleaned"
+
+    seccion_clause_editorial = f"AND e.segment = @seccion" if seccion_filter else ""
+    seccion_clause_gold = f"AND g.section = @seccion" if seccion_filter else ""
+    pais_cte = (
+        f"""authors_in_country AS (
+                SELECT email_lower as email FROM `{TABLE_AUTHORS}`
+                WHERE country_upper = @pais
             ),
-            urls_del_usuario AS (
-                SELECT DISTINCT t.story_url
-                FROM todas_notas_usuario t
-                INNER JOIN notas_publicadas p ON t.note_id = p.note_id
-            )
+            """
+        if pais_filter else ""
+    )
+    join_editorial = "INNER JOIN authors_in_country a ON e.email_editor_lower = a.email" if pais_filter else ""
+    join_gold = "INNER JOIN authors_in_country a ON LOWER(g.creator_email) = a.email" if pais_filter else ""
+
+    cur_e = ("e.event_timestamp >= TIMESTAMP(@start_date)"
+             " AND e.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)")
+    prev_e = ("e.event_timestamp >= TIMESTAMP(@prev_start)"
+              " AND e.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@prev_end), INTERVAL 1 DAY)")
+    cur_g = ("g.date BETWEEN DATE(@start_date) AND DATE(@end_date)"
+             " AND DATE(g.publish_date) BETWEEN DATE(@start_date) AND DATE(@end_date)")
+    prev_g = ("g.date BETWEEN DATE(@prev_start) AND DATE(@prev_end)"
+              " AND DATE(g.publish_date) BETWEEN DATE(@prev_start) AND DATE(@prev_end)")
+    cur_s = ("s.event_date BETWEEN DATE(@start_date) AND DATE(@end_date)"
+             " AND DATE(g.publish_date) BETWEEN DATE(@start_date) AND DATE(@end_date)")
+    prev_s = ("s.event_date BETWEEN DATE(@prev_start) AND DATE(@prev_end)"
+              " AND DATE(g.publish_date) BETWEEN DATE(@prev_start) AND DATE(@prev_end)")
+
+    return f"""
+        WITH {pais_cte}produccion AS (
             SELECT
-                SUM(g.visits) as visitas_totales,
-                SUM(g.pageviews) as pageviews_totales,
-                SAFE_DIVIDE(SUM(g.total_time_seconds), SUM(g.visits)) as tiempo_promedio_segundos,
-                SAFE_DIVIDE(SUM(g.scrolls), SUM(g.visits)) as scroll_promedio,
-                SUM(g.scrolls) as scrolls_totales
-            FROM `{TABLE_PRODUCTIVITY}` g
-            {join_clause}
-            WHERE g.date BETWEEN '{start_date}' AND '{end_date}'
-              AND g.article_url IN (SELECT story_url FROM urls_del_usuario)
-              {seccion_clause} {pais_clause}
-        """
-        
-        query_users = f"""
-            WITH notas_create AS (
-                SELECT DISTINCT note_id, story_url FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}' AND action_type = 'CREATE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}' AND story_url IS NOT NULL
-            ),
-            notas_publish AS (
-                SELECT DISTINCT note_id, story_url FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}' AND action_type = 'FIRST_PUBLISH'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}' AND story_url IS NOT NULL
-            ),
-            primer_save AS (
-                SELECT note_id, email_editor, story_url,
-                       ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                FROM `{TABLE_EDITORIAL}` WHERE action_type = 'SAVE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}' AND story_url IS NOT NULL
-            ),
-            notas_con_create AS (SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'),
-            notas_primer_save AS (
-                SELECT ps.note_id, ps.story_url FROM primer_save ps
-                WHERE ps.rn = 1 AND ps.email_editor = '{email_filter}'
-                  AND ps.note_id NOT IN (SELECT note_id FROM notas_con_create)
-            ),
-            todas_notas_usuario AS (
-                SELECT note_id, story_url FROM notas_create UNION DISTINCT
-                SELECT note_id, story_url FROM notas_publish UNION DISTINCT
-                SELECT note_id, story_url FROM notas_primer_save
-            ),
-            notas_publicadas AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE action_type = 'FIRST_PUBLISH' AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            urls_del_usuario AS (
-                SELECT DISTINCT t.story_url FROM todas_notas_usuario t
-                INNER JOIN notas_publicadas p ON t.note_id = p.note_id
-            )
-            SELECT SUM(s.daily_users) as usuarios_unicos
-            FROM `{TABLE_SILVER}` s
-            WHERE s.event_date BETWEEN '{start_date}' AND '{end_date}'
-              AND s.article_url IN (SELECT story_url FROM urls_del_usuario)
-        """
-    else:
-        # Sin filtro de email: query simple
-        query = f"""
+                APPROX_COUNT_DISTINCT(IF({cur_e} AND e.action_type = 'CREATE', e.email_editor, NULL)) as cur_creadores,
+                APPROX_COUNT_DISTINCT(IF({cur_e} AND e.action_type = 'FIRST_PUBLISH', e.email_editor, NULL)) as cur_publicadores,
+                APPROX_COUNT_DISTINCT(IF({cur_e} AND e.action_type = 'FIRST_PUBLISH', e.note_id, NULL)) as cur_notas,
+                APPROX_COUNT_DISTINCT(IF({prev_e} AND e.action_type = 'CREATE', e.email_editor, NULL)) as prev_creadores,
+                APPROX_COUNT_DISTINCT(IF({prev_e} AND e.action_type = 'FIRST_PUBLISH', e.email_editor, NULL)) as prev_publicadores,
+                APPROX_COUNT_DISTINCT(IF({prev_e} AND e.action_type = 'FIRST_PUBLISH', e.note_id, NULL)) as prev_notas
+            FROM `{TABLE_EDITORIAL}` e
+            {join_editorial}
+            WHERE e.action_type IN ('CREATE', 'FIRST_PUBLISH')
+              AND e.event_timestamp >= TIMESTAMP(@prev_start) AND e.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
+              {seccion_clause_editorial}
+        ),
+        trafico AS (
             SELECT
-                SUM(g.visits) as visitas_totales,
-                SUM(g.pageviews) as pageviews_totales,
-                SAFE_DIVIDE(SUM(g.total_time_seconds), SUM(g.visits)) as tiempo_promedio_segundos,
-                SAFE_DIVIDE(SUM(g.scrolls), SUM(g.visits)) as scroll_promedio,
-                SUM(g.scrolls) as scrolls_totales
+                IFNULL(SUM(IF({cur_g}, g.visits, NULL)), 0) as cur_visitas,
+                IFNULL(SUM(IF({cur_g}, g.pageviews, NULL)), 0) as cur_pageviews,
+                IFNULL(SAFE_DIVIDE(SUM(IF({cur_g}, g.total_time_seconds, NULL)), SUM(IF({cur_g}, g.visits, NULL))), 0) as cur_tiempo_segundos,
+                IFNULL(SAFE_DIVIDE(SUM(IF({cur_g}, g.scrolls, NULL)), SUM(IF({cur_g}, g.visits, NULL))), 0) as cur_scroll_promedio,
+                IFNULL(SUM(IF({cur_g}, g.scrolls, NULL)), 0) as cur_scrolls,
+                IFNULL(SUM(IF({prev_g}, g.visits, NULL)), 0) as prev_visitas,
+                IFNULL(SUM(IF({prev_g}, g.pageviews, NULL)), 0) as prev_pageviews,
+                IFNULL(SAFE_DIVIDE(SUM(IF({prev_g}, g.total_time_seconds, NULL)), SUM(IF({prev_g}, g.visits, NULL))), 0) as prev_tiempo_segundos,
+                IFNULL(SAFE_DIVIDE(SUM(IF({prev_g}, g.scrolls, NULL)), SUM(IF({prev_g}, g.visits, NULL))), 0) as prev_scroll_promedio,
+                IFNULL(SUM(IF({prev_g}, g.scrolls, NULL)), 0) as prev_scrolls
             FROM `{TABLE_PRODUCTIVITY}` g
-            {join_clause}
-            WHERE g.date BETWEEN '{start_date}' AND '{end_date}'
-              AND DATE(g.publish_date) BETWEEN '{start_date}' AND '{end_date}'
-              {seccion_clause} {pais_clause}
-        """
-        
-        query_users = f"""
-            SELECT SUM(s.daily_users) as usuarios_unicos
+            {join_gold}
+            WHERE g.date BETWEEN DATE(@prev_start) AND DATE(@end_date)
+              AND DATE(g.publish_date) BETWEEN DATE(@prev_start) AND DATE(@end_date)
+              {seccion_clause_gold}
+        ),
+        usuarios AS (
+            SELECT
+                IFNULL(SUM(IF({cur_s}, s.daily_users, NULL)), 0) as cur_usuarios,
+                IFNULL(SUM(IF({prev_s}, s.daily_users, NULL)), 0) as prev_usuarios
             FROM `{TABLE_SILVER}` s
             INNER JOIN `{TABLE_PRODUCTIVITY}` g ON s.article_url = g.article_url AND s.event_date = g.date
-            {join_clause}
-            WHERE s.event_date BETWEEN '{start_date}' AND '{end_date}'
-              AND DATE(g.publish_date) BETWEEN '{start_date}' AND '{end_date}'
-              {seccion_clause} {pais_clause}
-        """
-    
-    try:
-        df = _client.query(query).to_dataframe()
-        if not df.empty:
-            row = df.iloc[0]
-            result['visitas_totales'] = int(row['visitas_totales']) if pd.notna(row['visitas_totales']) else 0
-            result['pageviews_totales'] = int(row['pageviews_totales']) if pd.notna(row['pageviews_totales']) else 0
-            result['tiempo_promedio_min'] = (float(row['tiempo_promedio_segundos']) if pd.notna(row['tiempo_promedio_segundos']) else 0) / 60
-            result['scroll_promedio'] = float(row['scroll_promedio']) if pd.notna(row['scroll_promedio']) else 0
-            result['scrolls_totales'] = int(row['scrolls_totales']) if pd.notna(row['scrolls_totales']) else 0
-    except Exception as e:
-        st.error(f"Error cargando métricas de tráfico: {e}")
-    
-    try:
-        df_users = _client.query(query_users).to_dataframe()
-        if not df_users.empty:
-            result['usuarios_unicos'] = int(df_users.iloc[0]['usuarios_unicos']) if pd.notna(df_users.iloc[0]['usuarios_unicos']) else 0
-    except:
-        pass
-    
+            {join_gold}
+            WHERE s.event_date BETWEEN DATE(@prev_start) AND DATE(@end_date)
+              AND DATE(g.publish_date) BETWEEN DATE(@prev_start) AND DATE(@end_date)
+              {seccion_clause_gold}
+        )
+        SELECT p.*, t.*, u.*
+        FROM produccion p
+        CROSS JOIN trafico t
+        CROSS JOIN usuarios u
+    """
+
+
+def _previous_period(start_date: str, end_date: str) -> tuple:
+    """Devuelve (inicio, fin) del período inmediatamente anterior, misma duración."""
+    start_dt = datetime.strptime(start_date, '%Y-%m-%d')
+    end_dt = datetime.strptime(end_date, '%Y-%m-%d')
+    period_days = (end_dt - start_dt).days + 1
+
+    prev_end = start_dt - timedelta(days=1)
+    prev_start = prev_end - timedelta(days=period_days - 1)
+
+    return (prev_start.strftime('%Y-%m-%d'), prev_end.strftime('%Y-%m-%d'))
+
+
+def _kpi_dict_from_row(row, prefix: str) -> dict:
+    """Arma el dict de KPIs desde las columnas {prefix}_* de la fila dual."""
+    # Con IFNULL(..., 0) en SQL las columnas llegan garantizadas no-nulas
+    result = {
+        'creadores_activos': int(row[f'{prefix}_creadores']),
+        'publicadores_activos': int(row[f'{prefix}_publicadores']),
+        'notas_publicadas': int(row[f'{prefix}_notas']),
+        'visitas_totales': int(row[f'{prefix}_visitas']),
+        'pageviews_totales': int(row[f'{prefix}_pageviews']),
+        'tiempo_promedio_min': float(row[f'{prefix}_tiempo_segundos']) / 60,
+        'scroll_promedio': float(row[f'{prefix}_scroll_promedio']),
+        'scrolls_totales': int(row[f'{prefix}_scrolls']),
+        'usuarios_unicos': int(row[f'{prefix}_usuarios']),
+    }
+    result['productividad'] = result['visitas_totales'] / max(result['notas_publicadas'], 1)
     return result
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
-def load_kpis(_client, start_date: str, end_date: str, email_filter: str = None, seccion_filter: str = None, pais_filter: str = None) -> dict:
+def load_kpis_pair(_client, start_date: str, end_date: str, email_filter: str = None, seccion_filter: str = None, pais_filter: str = None) -> tuple:
     """
-    Combina métricas de producción (arc_editorial_activity) y tráfico (GA4).
+    Carga los KPIs del período actual y del anterior.
+
+    Sin filtro de email, ambos períodos salen de UN solo scan con agregación
+    condicional por ventana (mitad de bytes y un round-trip menos). Con filtro
+    de email se reutiliza la query por ventana, porque las notas del usuario
+    se materializan por rango de fechas.
     """
-    # Cargar métricas de producción desde arc_editorial_activity
-    production = load_production_metrics(_client, start_date, end_date, email_filter, seccion_filter, pais_filter)
-    
-    # Cargar métricas de tráfico desde GA4
-    traffic = load_traffic_metrics(_client, start_date, end_date, email_filter, seccion_filter, pais_filter)
-    
-    # Calcular productividad
-    notas = production['notas_publicadas']
-    visitas = traffic['visitas_totales']
-    productividad = visitas / max(notas, 1)
-    
-    return {
-        'creadores_activos': production['creadores_activos'],
-        'publicadores_activos': production['publicadores_activos'],
-        'notas_publicadas': production['notas_publicadas'],
-        'visitas_totales': traffic['visitas_totales'],
-        'usuarios_unicos': traffic['usuarios_unicos'],
-        'pageviews_totales': traffic['pageviews_totales'],
-        'tiempo_promedio_min': traffic['tiempo_promedio_min'],
-        'scroll_promedio': traffic['scroll_promedio'],
-        'scrolls_totales': traffic['scrolls_totales'],
-        'productividad': productividad
+    prev_start, prev_end = _previous_period(start_date, end_date)
+
+    if email_filter:
+        return (
+            _load_kpis_window(_client, start_date, end_date, email_filter, seccion_filter, pais_filter),
+            _load_kpis_window(_client, prev_start, prev_end, email_filter, seccion_filter, pais_filter),
+        )
+
+    empty = {
+        'creadores_activos': 0, 'publicadores_activos': 0, 'notas_publicadas': 0,
+        'visitas_totales': 0, 'usuarios_unicos': 0, 'pageviews_totales': 0,
+        'tiempo_promedio_min': 0, 'scroll_promedio': 0, 'scrolls_totales': 0,
+        'productividad': 0
     }
 
+    query = load_kpis_dual_sql(seccion_filter, pais_filter)
+    params = {'start_date': start_date, 'end_date': end_date,
+              'prev_start': prev_start, 'prev_end': prev_end}
+    if seccion_filter:
+        params['seccion'] = seccion_filter
+    if pais_filter:
+        params['pais'] = pais_filter.upper()
+
+    # Pre-flight: si el scan dual (período actual + anterior) se va de
+    # presupuesto, se degrada a solo el período actual y se omite la
+    # comparación, en lugar de pagar el doble de bytes.
+    try:
+        estimado = estimate_bytes(_client, query, **params)
+    except Exception:
+        estimado = 0
+
+    if estimado > _MAX_SCAN_BYTES:
+        st.warning(
+            f"El rango elegido escanearía {estimado / 1024 ** 3:.1f} GB; "
+            "se omite la comparación con el período anterior."
+        )
+        return (
+            _load_kpis_window(_client, start_date, end_date, None, seccion_filter, pais_filter),
+            empty,
+        )
+
+    try:
+        row = _scalar_row(_client, query, **params)
+    except Exception as e:
+        st.error(f"Error cargando KPIs: {e}")
+        return (empty, dict(empty))
 
-@st.cache_data(ttl=3600, show_spinner=False)
-def load_previous_kpis(_client, start_date: str, end_date: str, email_filter: str = None, seccion_filter: str = None, pais_filter: str = None) -> dict:
-    """Carga KPIs del período anterior para comparación."""
-    start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-    end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-    period_days = (end_dt - start_dt).days + 1
-    
-    prev_end = start_dt - timedelta(days=1)
-    prev_start = prev_end - timedelta(days=period_days - 1)
-    
-    prev_start_str = prev_start.strftime('%Y-%m-%d')
-    prev_end_str = prev_end.strftime('%Y-%m-%d')
-    
-    return load_kpis(_client, prev_start_str, prev_end_str, email_filter, seccion_filter, pais_filter)
+    if row is None:
+        return (empty, dict(empty))
+
+    return (_kpi_dict_from_row(row, 'cur'), _kpi_dict_from_row(row, 'prev'))
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
+@persistent_cache(ttl=3600)
 def load_top_publishers(_client, start_date: str, end_date: str, limit: int = 10, email_filter: str = None, seccion_filter: str = None, pais_filter: str = None) -> pd.DataFrame:
     """
     Top 10 Publicadores:
     - Con filtro de email: muestra QUIÉN PUBLICÓ las notas del usuario
     - Sin filtro: muestra los publicadores con más FIRST_PUBLISH
     """
-    seccion_clause = f"AND e.segment = '{seccion_filter}'" if seccion_filter else ""
-    pais_clause = f"AND UPPER(a.country) = UPPER('{pais_filter}')" if pais_filter else ""
+    seccion_clause = "AND e.segment = @seccion" if seccion_filter else ""
+    pais_clause = "AND a.country_upper = @pais" if pais_filter else ""
     
     if email_filter:
-        # Mostrar QUIÉN PUBLICÓ las notas del usuario (no necesariamente el usuario)
+        # Mostrar QUIÉN PUBLICÓ las notas del usuario (no necesariamente el usuario).
+        # El set de notas sale de la tabla de scratch compartida, con la misma
+        # atribución (todo el historial) que KPIs y top artículos
+        notes_table = materialize_user_notes(_client, email_filter, start_date, end_date)
         query = f"""
-            WITH notas_create AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}'
-                  AND action_type = 'CREATE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            notas_publish AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}'
-                  AND action_type = 'FIRST_PUBLISH'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            primer_save AS (
-                SELECT note_id, email_editor,
-                       ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                FROM `{TABLE_EDITORIAL}`
-                WHERE action_type = 'SAVE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            notas_con_create AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'
-            ),
-            notas_primer_save AS (
-                SELECT ps.note_id FROM primer_save ps
-                WHERE ps.rn = 1 
-                  AND ps.email_editor = '{email_filter}'
-                  AND ps.note_id NOT IN (SELECT note_id FROM notas_con_create)
-            ),
-            todas_notas_usuario AS (
-                SELECT note_id FROM notas_create UNION DISTINCT
-                SELECT note_id FROM notas_publish UNION DISTINCT
-                SELECT note_id FROM notas_primer_save
-            )
+            WITH todas_notas_usuario AS (
+                     SELECT note_id FROM `{notes_table}`
+                 )
             -- Buscar QUIÉN hizo FIRST_PUBLISH en las notas del usuario
             SELECT 
                 CASE 
-                    WHEN LOWER(e.email_editor) = 'infobae' THEN 'Infobae (agencias)'
+                    WHEN e.email_editor_lower = 'infobae' THEN 'Infobae (agencias)'
                     ELSE COALESCE(a.complete_name, e.email_editor) 
                 END as Publicador,
                 a.country as Pais,
-                COUNT(DISTINCT e.note_id) as notas_publicadas
+                APPROX_COUNT_DISTINCT(e.note_id) as notas_publicadas
             FROM `{TABLE_EDITORIAL}` e
-            LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(e.email_editor) = LOWER(a.email)
+            INNER JOIN todas_notas_usuario u ON e.note_id = u.note_id
+            LEFT JOIN `{TABLE_AUTHORS}` a ON e.email_editor_lower = a.email_lower
             WHERE e.action_type = 'FIRST_PUBLISH'
-              AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-              AND e.note_id IN (SELECT note_id FROM todas_notas_usuario)
+              AND e.event_timestamp >= TIMESTAMP(@start_date) AND e.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
               AND e.email_editor IS NOT NULL AND e.email_editor != ''
             GROUP BY Publicador, Pais
             ORDER BY notas_publicadas DESC
-            LIMIT {limit}
+            LIMIT @limit
         """
     else:
         query = f"""
             SELECT 
                 CASE 
-                    WHEN LOWER(e.email_editor) = 'infobae' THEN 'Infobae (agencias)'
+                    WHEN e.email_editor_lower = 'infobae' THEN 'Infobae (agencias)'
                     ELSE COALESCE(a.complete_name, e.email_editor) 
                 END as Publicador,
                 a.country as Pais,
                 COUNT(*) as notas_publicadas
             FROM `{TABLE_EDITORIAL}` e
-            LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(e.email_editor) = LOWER(a.email)
+            LEFT JOIN `{TABLE_AUTHORS}` a ON e.email_editor_lower = a.email_lower
             WHERE e.action_type = 'FIRST_PUBLISH'
-              AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
+              AND e.event_timestamp >= TIMESTAMP(@start_date) AND e.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
               AND e.email_editor IS NOT NULL AND e.email_editor != ''
               {seccion_clause} {pais_clause}
             GROUP BY Publicador, Pais
             ORDER BY notas_publicadas DESC
-        LIMIT {limit}
+        LIMIT @limit
     """
+    params = _params_for(query, start_date=start_date, end_date=end_date,
+                         limit=limit, email=email_filter, seccion=seccion_filter,
+                         pais=pais_filter.upper() if pais_filter else None)
     try:
-        return _client.query(query).to_dataframe()
+        return _df(_client, query, dtypes={'notas_publicadas': 'int32'}, **params)
     except Exception as e:
         st.error(f"Error cargando top publicadores: {e}")
         return pd.DataFrame()
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
+@persistent_cache(ttl=3600)
 def load_top_creators(_client, start_date: str, end_date: str, limit: int = 10, email_filter: str = None, seccion_filter: str = None, pais_filter: str = None) -> pd.DataFrame:
     """
     Top 10 Creadores:
     - Con filtro de email: muestra QUIÉN CREÓ las notas del usuario
     - Sin filtro: muestra los creadores con más notas
     """
-    seccion_clause = f"AND e.segment = '{seccion_filter}'" if seccion_filter else ""
-    pais_clause = f"AND UPPER(a.country) = UPPER('{pais_filter}')" if pais_filter else ""
+    seccion_clause = "AND e.segment = @seccion" if seccion_filter else ""
+    pais_clause = "AND a.country_upper = @pais" if pais_filter else ""
     
     if email_filter:
-        # Mostrar QUIÉN CREÓ las notas del usuario (CREATE o PRIMER_SAVE sin CREATE)
+        # Mostrar QUIÉN CREÓ las notas del usuario (CREATE o PRIMER_SAVE sin CREATE).
+        # Las notas salen de la tabla de scratch compartida y el creador real de
+        # los roles precomputados, con la misma atribución que KPIs
+        notes_table = materialize_user_notes(_client, email_filter, start_date, end_date)
         query = f"""
-            WITH notas_create AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}'
-                  AND action_type = 'CREATE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            notas_publish AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}'
-                  AND action_type = 'FIRST_PUBLISH'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            primer_save AS (
-                SELECT note_id, email_editor,
-                       ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                FROM `{TABLE_EDITORIAL}`
-                WHERE action_type = 'SAVE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            notas_con_create AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'
-            ),
-            notas_primer_save AS (
-                SELECT ps.note_id FROM primer_save ps
-                WHERE ps.rn = 1 
-                  AND ps.email_editor = '{email_filter}'
-                  AND ps.note_id NOT IN (SELECT note_id FROM notas_con_create)
-            ),
-            todas_notas_usuario AS (
-                SELECT note_id FROM notas_create UNION DISTINCT
-                SELECT note_id FROM notas_publish UNION DISTINCT
-                SELECT note_id FROM notas_primer_save
-            ),
-            -- Creadores: CREATE si existe, si no PRIMER_SAVE
-            creadores_create AS (
-                SELECT note_id, email_editor as creador_email
-                FROM `{TABLE_EDITORIAL}`
-                WHERE action_type = 'CREATE'
-            ),
-            primer_save_all AS (
-                SELECT note_id, email_editor, ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                FROM `{TABLE_EDITORIAL}` WHERE action_type = 'SAVE'
-            ),
-            creadores_primer_save AS (
-                SELECT ps.note_id, ps.email_editor as creador_email
-                FROM primer_save_all ps
-                WHERE ps.rn = 1 AND ps.note_id NOT IN (SELECT note_id FROM creadores_create)
-            ),
-            creadores_reales AS (
-                SELECT note_id, creador_email FROM creadores_create
-                UNION ALL
-                SELECT note_id, creador_email FROM creadores_primer_save
+            WITH creadores_notas_usuario AS (
+                SELECT u.note_id, r.creador_email
+                FROM `{notes_table}` u
+                LEFT JOIN `{TABLE_NOTE_ROLES}` r ON u.note_id = r.note_id
             )
             -- Buscar QUIÉN CREÓ las notas del usuario
-            SELECT 
-                CASE 
+            SELECT
+                CASE
                     WHEN LOWER(cr.creador_email) = 'infobae' THEN 'Infobae (agencias)'
-                    ELSE COALESCE(a.complete_name, cr.creador_email) 
+                    ELSE COALESCE(a.complete_name, cr.creador_email)
                 END as Creador,
                 a.country as Pais,
-                COUNT(DISTINCT cr.note_id) as notas_creadas
-            FROM creadores_reales cr
-            LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(cr.creador_email) = LOWER(a.email)
-            WHERE cr.note_id IN (SELECT note_id FROM todas_notas_usuario)
-              AND cr.creador_email IS NOT NULL AND cr.creador_email != ''
+                APPROX_COUNT_DISTINCT(cr.note_id) as notas_creadas
+            FROM creadores_notas_usuario cr
+            LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(cr.creador_email) = a.email_lower
+            WHERE cr.creador_email IS NOT NULL AND cr.creador_email != ''
             GROUP BY Creador, Pais
             ORDER BY notas_creadas DESC
-            LIMIT {limit}
+            LIMIT @limit
         """
     else:
         # Sin filtro: mostrar todos los creadores (solo CREATE por simplicidad)
         query = f"""
             SELECT 
                 CASE 
-                    WHEN LOWER(e.email_editor) = 'infobae' THEN 'Infobae (agencias)'
+                    WHEN e.email_editor_lower = 'infobae' THEN 'Infobae (agencias)'
                     ELSE COALESCE(a.complete_name, e.email_editor) 
                 END as Creador,
                 a.country as Pais,
                 COUNT(*) as notas_creadas
             FROM `{TABLE_EDITORIAL}` e
-            LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(e.email_editor) = LOWER(a.email)
+            LEFT JOIN `{TABLE_AUTHORS}` a ON e.email_editor_lower = a.email_lower
             WHERE e.action_type = 'CREATE'
-              AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
+              AND e.event_timestamp >= TIMESTAMP(@start_date) AND e.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
               AND e.email_editor IS NOT NULL AND e.email_editor != ''
               {seccion_clause} {pais_clause}
             GROUP BY Creador, Pais
             ORDER BY notas_creadas DESC
-            LIMIT {limit}
+            LIMIT @limit
         """
     
+    params = _params_for(query, start_date=start_date, end_date=end_date,
+                         limit=limit, email=email_filter, seccion=seccion_filter,
+                         pais=pais_filter.upper() if pais_filter else None)
     try:
-        return _client.query(query).to_dataframe()
+        return _df(_client, query, dtypes={'notas_creadas': 'int32'}, **params)
     except Exception as e:
         st.error(f"Error cargando top creadores: {e}")
         return pd.DataFrame()
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
-def load_daily_evolution(_client, start_date: str, end_date: str, metric: str = 'visits', email_filter: str = None, seccion_filter: str = None, pais_filter: str = None) -> pd.DataFrame:
-    """Carga evolución diaria agregada en BigQuery. Usa lógica de PRIMER_SAVE como creador."""
+@persistent_cache(ttl=3600)
+def load_all_daily(_client, start_date: str, end_date: str, email_filter: str = None, seccion_filter: str = None, pais_filter: str = None) -> pd.DataFrame:
+    """
+    Carga todas las series diarias (notas, users, visits, pageviews, scrolls)
+    en UNA sola query. El selector de métrica de la Zona Temporal cambiaba de
+    query por métrica repitiendo el mismo scan editorial; ahora las cinco
+    series comparten job, scan y entrada de caché, y el wrapper
+    load_daily_evolution solo elige la columna.
+    """
     TABLE_SILVER = "data-prod-454014.Silver.GA4_productivity_cleaned"
-    seccion_clause = f"AND e.segment = '{seccion_filter}'" if seccion_filter else ""
-    seccion_clause_gold = f"AND g.section = '{seccion_filter}'" if seccion_filter else ""
-    pais_clause = f"AND UPPER(a.country) = UPPER('{pais_filter}')" if pais_filter else ""
-    join_clause = f"LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(e.email_editor) = LOWER(a.email)" if pais_filter else ""
-    
-    if metric == 'notas':
-        if email_filter:
-            # Usar CTEs con PRIMER_SAVE
-            query = f"""
-                WITH notas_create AS (
-                    SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                    WHERE email_editor = '{email_filter}' AND action_type = 'CREATE'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                ),
-                notas_publish AS (
-                    SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                    WHERE email_editor = '{email_filter}' AND action_type = 'FIRST_PUBLISH'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                ),
-                primer_save AS (
-                    SELECT note_id, email_editor, ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                    FROM `{TABLE_EDITORIAL}` WHERE action_type = 'SAVE'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                ),
-                notas_con_create AS (SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'),
-                notas_primer_save AS (
-                    SELECT ps.note_id FROM primer_save ps
-                    WHERE ps.rn = 1 AND ps.email_editor = '{email_filter}'
-                      AND ps.note_id NOT IN (SELECT note_id FROM notas_con_create)
-                ),
-                todas_notas_usuario AS (
-                    SELECT note_id FROM notas_create UNION DISTINCT
-                    SELECT note_id FROM notas_publish UNION DISTINCT
-                    SELECT note_id FROM notas_primer_save
-                )
-                SELECT DATE(e.event_timestamp) as fecha, COUNT(DISTINCT e.note_id) as valor
+    seccion_clause = "AND e.segment = @seccion" if seccion_filter else ""
+    seccion_clause_gold = "AND g.section = @seccion" if seccion_filter else ""
+    seccion_clause_fact = "AND section = @seccion" if seccion_filter else ""
+    pais_clause = "AND a.country_upper = @pais" if pais_filter else ""
+    pais_clause_fact = "AND country = @pais" if pais_filter else ""
+    join_clause = f"LEFT JOIN `{TABLE_AUTHORS}` a ON e.email_editor_lower = a.email_lower" if pais_filter else ""
+    # El rollup por URL no conserva sección; con filtro de sección se cae a Gold
+    tabla_trafico = TABLE_PRODUCTIVITY if seccion_filter else TABLE_STORY_TRAFFIC
+
+    if email_filter:
+        # Notas del usuario desde la tabla de scratch compartida (misma
+        # atribución que KPIs y top artículos)
+        notes_table = materialize_user_notes(_client, email_filter, start_date, end_date)
+        query = f"""
+            WITH todas_notas_usuario AS (
+                     SELECT note_id FROM `{notes_table}`
+                 ),
+            urls_usuario AS (
+                SELECT DISTINCT story_url FROM `{notes_table}`
+                WHERE is_published AND story_url IS NOT NULL
+            ),
+            notas AS (
+                SELECT DATE(e.event_timestamp) as fecha, COUNT(DISTINCT e.note_id) as notas
                 FROM `{TABLE_EDITORIAL}` e
+                INNER JOIN todas_notas_usuario u ON e.note_id = u.note_id
                 WHERE e.action_type = 'FIRST_PUBLISH'
-                  AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                  AND e.note_id IN (SELECT note_id FROM todas_notas_usuario)
+                  AND e.event_timestamp >= TIMESTAMP(@start_date) AND e.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
                   {seccion_clause}
-                GROUP BY fecha ORDER BY fecha
-            """
-        else:
-            query = f"""
-                SELECT DATE(e.event_timestamp) as fecha, COUNT(*) as valor
+                GROUP BY fecha
+            ),
+            usuarios AS (
+                SELECT s.event_date as fecha, SUM(s.daily_users) as users
+                FROM `{TABLE_SILVER}` s
+                INNER JOIN urls_usuario u ON s.article_url = u.story_url
+                WHERE s.event_date BETWEEN DATE(@start_date) AND DATE(@end_date)
+                GROUP BY fecha
+            ),
+            trafico AS (
+                SELECT g.date as fecha, SUM(g.visits) as visits,
+                       SUM(g.pageviews) as pageviews, SUM(g.scrolls) as scrolls
+                FROM `{tabla_trafico}` g
+                INNER JOIN urls_usuario u ON g.article_url = u.story_url
+                WHERE g.date BETWEEN DATE(@start_date) AND DATE(@end_date)
+                  {seccion_clause_gold}
+                GROUP BY fecha
+            )
+            SELECT CAST(COALESCE(n.fecha, t.fecha, us.fecha) AS TIMESTAMP) as fecha,
+                   IFNULL(n.notas, 0) as notas,
+                   IFNULL(us.users, 0) as users,
+                   IFNULL(t.visits, 0) as visits,
+                   IFNULL(t.pageviews, 0) as pageviews,
+                   IFNULL(t.scrolls, 0) as scrolls
+            FROM notas n
+            FULL OUTER JOIN trafico t ON n.fecha = t.fecha
+            FULL OUTER JOIN usuarios us ON COALESCE(n.fecha, t.fecha) = us.fecha
+            ORDER BY fecha
+        """
+    else:
+        query = f"""
+            WITH notas AS (
+                SELECT DATE(e.event_timestamp) as fecha, COUNT(*) as notas
                 FROM `{TABLE_EDITORIAL}` e {join_clause}
                 WHERE e.action_type = 'FIRST_PUBLISH'
-                  AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
+                  AND e.event_timestamp >= TIMESTAMP(@start_date) AND e.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
                   {seccion_clause} {pais_clause}
-                GROUP BY fecha ORDER BY fecha
-            """
-    elif metric == 'users':
-        if email_filter:
-            query = f"""
-                WITH notas_create AS (
-                    SELECT DISTINCT note_id, story_url FROM `{TABLE_EDITORIAL}`
-                    WHERE email_editor = '{email_filter}' AND action_type = 'CREATE'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}' AND story_url IS NOT NULL
-                ),
-                notas_publish AS (
-                    SELECT DISTINCT note_id, story_url FROM `{TABLE_EDITORIAL}`
-                    WHERE email_editor = '{email_filter}' AND action_type = 'FIRST_PUBLISH'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}' AND story_url IS NOT NULL
-                ),
-                primer_save AS (
-                    SELECT note_id, email_editor, story_url, ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                    FROM `{TABLE_EDITORIAL}` WHERE action_type = 'SAVE'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}' AND story_url IS NOT NULL
-                ),
-                notas_con_create AS (SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'),
-                notas_primer_save AS (
-                    SELECT ps.note_id, ps.story_url FROM primer_save ps
-                    WHERE ps.rn = 1 AND ps.email_editor = '{email_filter}'
-                      AND ps.note_id NOT IN (SELECT note_id FROM notas_con_create)
-                ),
-                todas_notas_usuario AS (
-                    SELECT note_id, story_url FROM notas_create UNION DISTINCT
-                    SELECT note_id, story_url FROM notas_publish UNION DISTINCT
-                    SELECT note_id, story_url FROM notas_primer_save
-                ),
-                notas_publicadas AS (
-                    SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                    WHERE action_type = 'FIRST_PUBLISH' AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                ),
-                urls_usuario AS (
-                    SELECT DISTINCT t.story_url FROM todas_notas_usuario t
-                    INNER JOIN notas_publicadas p ON t.note_id = p.note_id
-                )
-                SELECT s.event_date as fecha, SUM(s.daily_users) as valor
-                FROM `{TABLE_SILVER}` s
-                WHERE s.event_date BETWEEN '{start_date}' AND '{end_date}'
-                  AND s.article_url IN (SELECT story_url FROM urls_usuario)
-                GROUP BY s.event_date ORDER BY s.event_date
-            """
-        else:
-            join_gold = f"LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(g.creator_email) = LOWER(a.email)" if pais_filter else ""
-            query = f"""
-                SELECT s.event_date as fecha, SUM(s.daily_users) as valor
-                FROM `{TABLE_SILVER}` s
-                INNER JOIN `{TABLE_PRODUCTIVITY}` g ON s.article_url = g.article_url AND s.event_date = g.date
-                {join_gold}
-                WHERE s.event_date BETWEEN '{start_date}' AND '{end_date}'
-                  AND DATE(g.publish_date) BETWEEN '{start_date}' AND '{end_date}'
-                  {seccion_clause_gold} {pais_clause}
-                GROUP BY s.event_date ORDER BY s.event_date
-            """
-    else:
-        if email_filter:
-            query = f"""
-                WITH notas_create AS (
-                    SELECT DISTINCT note_id, story_url FROM `{TABLE_EDITORIAL}`
-                    WHERE email_editor = '{email_filter}' AND action_type = 'CREATE'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}' AND story_url IS NOT NULL
-                ),
-                notas_publish AS (
-                    SELECT DISTINCT note_id, story_url FROM `{TABLE_EDITORIAL}`
-                    WHERE email_editor = '{email_filter}' AND action_type = 'FIRST_PUBLISH'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}' AND story_url IS NOT NULL
-                ),
-                primer_save AS (
-                    SELECT note_id, email_editor, story_url, ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                    FROM `{TABLE_EDITORIAL}` WHERE action_type = 'SAVE'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}' AND story_url IS NOT NULL
-                ),
-                notas_con_create AS (SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'),
-                notas_primer_save AS (
-                    SELECT ps.note_id, ps.story_url FROM primer_save ps
-                    WHERE ps.rn = 1 AND ps.email_editor = '{email_filter}'
-                      AND ps.note_id NOT IN (SELECT note_id FROM notas_con_create)
-                ),
-                todas_notas_usuario AS (
-                    SELECT note_id, story_url FROM notas_create UNION DISTINCT
-                    SELECT note_id, story_url FROM notas_publish UNION DISTINCT
-                    SELECT note_id, story_url FROM notas_primer_save
-                ),
-                notas_publicadas AS (
-                    SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                    WHERE action_type = 'FIRST_PUBLISH' AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                ),
-                urls_usuario AS (
-                    SELECT DISTINCT t.story_url FROM todas_notas_usuario t
-                    INNER JOIN notas_publicadas p ON t.note_id = p.note_id
-                )
-                SELECT g.date as fecha, SUM(g.{metric}) as valor
-                FROM `{TABLE_PRODUCTIVITY}` g
-                WHERE g.date BETWEEN '{start_date}' AND '{end_date}'
-                  AND g.article_url IN (SELECT story_url FROM urls_usuario)
-                  {seccion_clause_gold}
-                GROUP BY g.date ORDER BY g.date
-            """
-        else:
-            join_gold = f"LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(g.creator_email) = LOWER(a.email)" if pais_filter else ""
-            query = f"""
-                SELECT g.date as fecha, SUM(g.{metric}) as valor
-                FROM `{TABLE_PRODUCTIVITY}` g {join_gold}
-                WHERE g.date BETWEEN '{start_date}' AND '{end_date}'
-                  AND DATE(g.publish_date) BETWEEN '{start_date}' AND '{end_date}'
-                  {seccion_clause_gold} {pais_clause}
-                GROUP BY g.date ORDER BY g.date
-            """
-    
+                GROUP BY fecha
+            ),
+            trafico AS (
+                SELECT date as fecha, SUM(visits) as visits, SUM(pageviews) as pageviews,
+                       SUM(scrolls) as scrolls, SUM(daily_users) as users
+                FROM `{TABLE_FACT_DAILY}`
+                WHERE date BETWEEN DATE(@start_date) AND DATE(@end_date)
+                  AND publish_date BETWEEN DATE(@start_date) AND DATE(@end_date)
+                  {seccion_clause_fact} {pais_clause_fact}
+                GROUP BY fecha
+            )
+            SELECT CAST(COALESCE(n.fecha, t.fecha) AS TIMESTAMP) as fecha,
+                   IFNULL(n.notas, 0) as notas,
+                   IFNULL(t.users, 0) as users,
+                   IFNULL(t.visits, 0) as visits,
+                   IFNULL(t.pageviews, 0) as pageviews,
+                   IFNULL(t.scrolls, 0) as scrolls
+            FROM notas n
+            FULL OUTER JOIN trafico t ON n.fecha = t.fecha
+            ORDER BY fecha
+        """
+
+    params = _params_for(query, start_date=start_date, end_date=end_date,
+                         email=email_filter, seccion=seccion_filter,
+                         pais=pais_filter.upper() if pais_filter else None)
     try:
-        df = _client.query(query).to_dataframe()
-        df['fecha'] = pd.to_datetime(df['fecha'])
-        return df
-    except:
+        # fecha viaja como TIMESTAMP desde SQL y Arrow la entrega directamente
+        # como datetime64, sin pasada de parseo en pandas
+        dtypes = {c: 'int64' for c in ('notas', 'users', 'visits', 'pageviews', 'scrolls')}
+        return _df(_client, query, dtypes=dtypes, **params)
+    except gcp_exceptions.GoogleAPIError as e:
+        st.error(f"Error cargando evolución diaria: {e}")
+        return pd.DataFrame()
+
+
+def load_daily_evolution(_client, start_date: str, end_date: str, metric: str = 'visits', email_filter: str = None, seccion_filter: str = None, pais_filter: str = None) -> pd.DataFrame:
+    """Serie diaria de una métrica; recorta la carga combinada de load_all_daily."""
+    df = load_all_daily(_client, start_date, end_date, email_filter, seccion_filter, pais_filter)
+    if df.empty or metric not in df.columns:
         return pd.DataFrame()
+    return df[['fecha', metric]].rename(columns={metric: 'valor'})
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
+@persistent_cache(ttl=3600)
 def load_section_stats(_client, start_date: str, end_date: str, email_filter: str = None, seccion_filter: str = None, pais_filter: str = None) -> pd.DataFrame:
     """
     Carga estadísticas completas por sección.
     Usa lógica de PRIMER_SAVE como creador cuando hay filtro de email.
     """
-    seccion_clause_editorial = f"AND ed.segment = '{seccion_filter}'" if seccion_filter else ""
-    seccion_clause_gold = f"AND g.section = '{seccion_filter}'" if seccion_filter else ""
-    pais_clause_editorial = f"AND UPPER(a1.country) = UPPER('{pais_filter}')" if pais_filter else ""
-    pais_clause_gold = f"AND UPPER(a2.country) = UPPER('{pais_filter}')" if pais_filter else ""
-    join_editorial = f"LEFT JOIN `{TABLE_AUTHORS}` a1 ON LOWER(ed.email_editor) = LOWER(a1.email)" if pais_filter else ""
-    join_gold = f"LEFT JOIN `{TABLE_AUTHORS}` a2 ON LOWER(g.creator_email) = LOWER(a2.email)" if pais_filter else ""
+    seccion_clause_editorial = "AND ed.segment = @seccion" if seccion_filter else ""
+    seccion_clause_gold = "AND g.section = @seccion" if seccion_filter else ""
+    pais_clause_editorial = "AND a1.country_upper = @pais" if pais_filter else ""
+    pais_clause_gold = "AND a2.country_upper = @pais" if pais_filter else ""
+    join_editorial = f"LEFT JOIN `{TABLE_AUTHORS}` a1 ON ed.email_editor_lower = a1.email_lower" if pais_filter else ""
+    join_gold = f"LEFT JOIN `{TABLE_AUTHORS}` a2 ON LOWER(g.creator_email) = a2.email_lower" if pais_filter else ""
     
     if email_filter:
-        # CTEs con PRIMER_SAVE
+        # Notas del usuario desde la tabla de scratch compartida (misma
+        # atribución que KPIs y top artículos)
+        notes_table = materialize_user_notes(_client, email_filter, start_date, end_date)
         notas_usuario_cte = f"""
-            notas_create AS (
-                SELECT DISTINCT note_id, story_url FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}' AND action_type = 'CREATE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            notas_publish AS (
-                SELECT DISTINCT note_id, story_url FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}' AND action_type = 'FIRST_PUBLISH'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            primer_save AS (
-                SELECT note_id, email_editor, story_url, ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                FROM `{TABLE_EDITORIAL}` WHERE action_type = 'SAVE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            notas_con_create AS (SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'),
-            notas_primer_save AS (
-                SELECT ps.note_id, ps.story_url FROM primer_save ps
-                WHERE ps.rn = 1 AND ps.email_editor = '{email_filter}'
-                  AND ps.note_id NOT IN (SELECT note_id FROM notas_con_create)
-            ),
-            todas_notas_usuario AS (
-                SELECT note_id, story_url FROM notas_create UNION DISTINCT
-                SELECT note_id, story_url FROM notas_publish UNION DISTINCT
-                SELECT note_id, story_url FROM notas_primer_save
-            ),
-            notas_publicadas AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE action_type = 'FIRST_PUBLISH' AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
             notas_usuario_publicadas AS (
-                SELECT t.note_id, t.story_url FROM todas_notas_usuario t
-                INNER JOIN notas_publicadas p ON t.note_id = p.note_id
+                SELECT note_id FROM `{notes_table}` WHERE is_published
             ),
         """
-        note_filter_editorial = "AND ed.note_id IN (SELECT note_id FROM notas_usuario_publicadas)"
-        note_filter_gold = "AND g.article_url IN (SELECT story_url FROM notas_usuario_publicadas WHERE story_url IS NOT NULL)"
+        note_join_editorial = "INNER JOIN notas_usuario_publicadas np ON ed.note_id = np.note_id"
         pais_clause_editorial = ""
         pais_clause_gold = ""
     else:
         notas_usuario_cte = ""
-        note_filter_editorial = ""
-        note_filter_gold = ""
+        note_join_editorial = ""
     
     # Cuando hay email_filter, usar Silver (GA4_productivity_cleaned) directamente para el tráfico
     if email_filter:
         query = f"""
             WITH {notas_usuario_cte}
             editorial_stats AS (
-                SELECT 
-                    ed.segment as seccion,
-                    COUNT(DISTINCT ed.note_id) as notas,
-                    COUNT(DISTINCT CASE WHEN LOWER(ed.source) LIKE '%composer%' THEN ed.note_id END) as composer,
-                    COUNT(DISTINCT CASE WHEN LOWER(ed.source) LIKE '%scribnews%' THEN ed.note_id END) as scribnews
-                FROM `{TABLE_EDITORIAL}` ed
-                WHERE ed.action_type = 'FIRST_PUBLISH'
-                  AND DATE(ed.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                  AND ed.segment IS NOT NULL AND ed.segment != ''
-                  {note_filter_editorial} {seccion_clause_editorial}
-                GROUP BY ed.segment
+                -- src_cat se normaliza una vez por fila; los conteos por
+                -- fuente usan sketches HLL en vez de hash sets exactos
+                SELECT
+                    seccion,
+                    APPROX_COUNT_DISTINCT(note_id) as notas,
+                    APPROX_COUNT_DISTINCT(IF(src_cat = 1, note_id, NULL)) as composer,
+                    APPROX_COUNT_DISTINCT(IF(src_cat = 2, note_id, NULL)) as scribnews
+                FROM (
+                    SELECT ed.segment as seccion, ed.note_id,
+                           CASE WHEN LOWER(ed.source) LIKE '%composer%' THEN 1
+                                WHEN LOWER(ed.source) LIKE '%scribnews%' THEN 2
+                                ELSE 0 END as src_cat
+                    FROM `{TABLE_EDITORIAL}` ed
+                    {note_join_editorial}
+                    WHERE ed.action_type = 'FIRST_PUBLISH'
+                      AND ed.event_timestamp >= TIMESTAMP(@start_date) AND ed.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
+                      AND ed.segment IS NOT NULL AND ed.segment != ''
+                      {seccion_clause_editorial}
+                )
+                GROUP BY seccion
             ),
             urls_por_seccion AS (
                 SELECT DISTINCT ed.segment as seccion, ed.story_url
                 FROM `{TABLE_EDITORIAL}` ed
+                {note_join_editorial}
                 WHERE ed.action_type = 'FIRST_PUBLISH'
-                  AND DATE(ed.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
+                  AND ed.event_timestamp >= TIMESTAMP(@start_date) AND ed.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
                   AND ed.segment IS NOT NULL AND ed.segment != ''
                   AND ed.story_url IS NOT NULL
-                  {note_filter_editorial} {seccion_clause_editorial}
+                  {seccion_clause_editorial}
             ),
             traffic_stats AS (
                 SELECT 
@@ -1041,7 +1144,7 @@ def load_section_stats(_client, start_date: str, end_date: str, email_filter: st
                     SAFE_DIVIDE(SUM(g.sessions_with_scroll), SUM(g.daily_sessions)) as scroll_promedio
                 FROM urls_por_seccion u
                 INNER JOIN `{TABLE_PRODUCTIVITY_SILVER}` g ON u.story_url = g.article_url
-                WHERE g.event_date BETWEEN '{start_date}' AND '{end_date}'
+                WHERE g.event_date BETWEEN DATE(@start_date) AND DATE(@end_date)
                 GROUP BY u.seccion
             )
             SELECT 
@@ -1060,18 +1163,26 @@ def load_section_stats(_client, start_date: str, end_date: str, email_filter: st
     else:
         query = f"""
             WITH editorial_stats AS (
-                SELECT 
-                    ed.segment as seccion,
-                    COUNT(DISTINCT ed.note_id) as notas,
-                    COUNT(DISTINCT CASE WHEN LOWER(ed.source) LIKE '%composer%' THEN ed.note_id END) as composer,
-                    COUNT(DISTINCT CASE WHEN LOWER(ed.source) LIKE '%scribnews%' THEN ed.note_id END) as scribnews
-                FROM `{TABLE_EDITORIAL}` ed
-                {join_editorial}
-                WHERE ed.action_type = 'FIRST_PUBLISH'
-                  AND DATE(ed.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                  AND ed.segment IS NOT NULL AND ed.segment != ''
-                  {seccion_clause_editorial} {pais_clause_editorial}
-                GROUP BY ed.segment
+                -- src_cat se normaliza una vez por fila; los conteos por
+                -- fuente usan sketches HLL en vez de hash sets exactos
+                SELECT
+                    seccion,
+                    APPROX_COUNT_DISTINCT(note_id) as notas,
+                    APPROX_COUNT_DISTINCT(IF(src_cat = 1, note_id, NULL)) as composer,
+                    APPROX_COUNT_DISTINCT(IF(src_cat = 2, note_id, NULL)) as scribnews
+                FROM (
+                    SELECT ed.segment as seccion, ed.note_id,
+                           CASE WHEN LOWER(ed.source) LIKE '%composer%' THEN 1
+                                WHEN LOWER(ed.source) LIKE '%scribnews%' THEN 2
+                                ELSE 0 END as src_cat
+                    FROM `{TABLE_EDITORIAL}` ed
+                    {join_editorial}
+                    WHERE ed.action_type = 'FIRST_PUBLISH'
+                      AND ed.event_timestamp >= TIMESTAMP(@start_date) AND ed.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
+                      AND ed.segment IS NOT NULL AND ed.segment != ''
+                      {seccion_clause_editorial} {pais_clause_editorial}
+                )
+                GROUP BY seccion
             ),
             traffic_stats AS (
                 SELECT 
@@ -1081,8 +1192,8 @@ def load_section_stats(_client, start_date: str, end_date: str, email_filter: st
                     SAFE_DIVIDE(SUM(g.scrolls), SUM(g.visits)) as scroll_promedio
                 FROM `{TABLE_PRODUCTIVITY}` g
                 {join_gold}
-                WHERE g.date BETWEEN '{start_date}' AND '{end_date}'
-                  AND DATE(g.publish_date) BETWEEN '{start_date}' AND '{end_date}'
+                WHERE g.date BETWEEN DATE(@start_date) AND DATE(@end_date)
+                  AND DATE(g.publish_date) BETWEEN DATE(@start_date) AND DATE(@end_date)
                   AND g.section IS NOT NULL AND g.section != ''
                   {seccion_clause_gold} {pais_clause_gold}
                 GROUP BY g.section
@@ -1100,85 +1211,69 @@ def load_section_stats(_client, start_date: str, end_date: str, email_filter: st
             LEFT JOIN traffic_stats t ON e.seccion = t.seccion
             ORDER BY e.notas DESC
         """
+    params = _params_for(query, start_date=start_date, end_date=end_date,
+                         email=email_filter, seccion=seccion_filter,
+                         pais=pais_filter.upper() if pais_filter else None)
     try:
-        return _client.query(query).to_dataframe()
+        return _df(_client, query,
+                   dtypes={'notas': 'int32', 'composer': 'int32', 'scribnews': 'int32',
+                           'sesiones': 'int64', 'pageviews': 'int64'},
+                   **params)
     except Exception as e:
         st.error(f"Error cargando secciones: {e}")
         return pd.DataFrame()
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
+@persistent_cache(ttl=3600)
 def load_geo_data(_client, start_date: str, end_date: str, email_filter: str = None, seccion_filter: str = None, pais_filter: str = None) -> pd.DataFrame:
-    """Carga datos geográficos. Usa lógica de PRIMER_SAVE como creador."""
+    """
+    Carga datos geográficos. Usa lógica de PRIMER_SAVE como creador.
+    Lee del rollup mensual (ver sql/geo_sources_monthly.sql): las visitas se
+    agregan por mes calendario del período, no por día exacto.
+    """
     
     if email_filter or seccion_filter or pais_filter:
-        seccion_clause = f"AND e.segment = '{seccion_filter}'" if seccion_filter else ""
-        pais_clause = f"AND UPPER(a.country) = UPPER('{pais_filter}')" if pais_filter else ""
-        join_authors = f"LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(e.email_editor) = LOWER(a.email)" if pais_filter else ""
+        seccion_clause = "AND e.segment = @seccion" if seccion_filter else ""
+        pais_clause = "AND a.country_upper = @pais" if pais_filter else ""
+        join_authors = f"LEFT JOIN `{TABLE_AUTHORS}` a ON e.email_editor_lower = a.email_lower" if pais_filter else ""
         
         if email_filter:
+            # Notas del usuario desde la tabla de scratch compartida (misma
+            # atribución que KPIs y top artículos)
+            notes_table = materialize_user_notes(_client, email_filter, start_date, end_date)
             notas_usuario_cte = f"""
-                notas_create AS (
-                    SELECT DISTINCT note_id, story_url FROM `{TABLE_EDITORIAL}`
-                    WHERE email_editor = '{email_filter}' AND action_type = 'CREATE'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}' AND story_url IS NOT NULL
-                ),
-                notas_publish AS (
-                    SELECT DISTINCT note_id, story_url FROM `{TABLE_EDITORIAL}`
-                    WHERE email_editor = '{email_filter}' AND action_type = 'FIRST_PUBLISH'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}' AND story_url IS NOT NULL
-                ),
-                primer_save AS (
-                    SELECT note_id, email_editor, story_url, ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                    FROM `{TABLE_EDITORIAL}` WHERE action_type = 'SAVE'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}' AND story_url IS NOT NULL
-                ),
-                notas_con_create AS (SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'),
-                notas_primer_save AS (
-                    SELECT ps.note_id, ps.story_url FROM primer_save ps
-                    WHERE ps.rn = 1 AND ps.email_editor = '{email_filter}'
-                      AND ps.note_id NOT IN (SELECT note_id FROM notas_con_create)
-                ),
-                todas_notas_usuario AS (
-                    SELECT note_id, story_url FROM notas_create UNION DISTINCT
-                    SELECT note_id, story_url FROM notas_publish UNION DISTINCT
-                    SELECT note_id, story_url FROM notas_primer_save
-                ),
-                notas_publicadas AS (
-                    SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                    WHERE action_type = 'FIRST_PUBLISH' AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                ),
                 urls_usuario AS (
-                    SELECT DISTINCT t.story_url FROM todas_notas_usuario t
-                    INNER JOIN notas_publicadas p ON t.note_id = p.note_id
-                    WHERE t.story_url IS NOT NULL
+                    SELECT DISTINCT story_url FROM `{notes_table}`
+                    WHERE is_published AND story_url IS NOT NULL
                 ),
             """
-            note_filter = "AND e.story_url IN (SELECT story_url FROM urls_usuario)"
+            note_join = "INNER JOIN urls_usuario nu ON e.story_url = nu.story_url"
             pais_clause = ""
         else:
             notas_usuario_cte = ""
-            note_filter = ""
+            note_join = ""
         
         query = f"""
             WITH {notas_usuario_cte}
             urls_filtradas AS (
                 SELECT DISTINCT e.story_url
                 FROM `{TABLE_EDITORIAL}` e
+                {note_join}
                 {join_authors}
                 WHERE e.action_type = 'FIRST_PUBLISH'
-                  AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
+                  AND e.event_timestamp >= TIMESTAMP(@start_date) AND e.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
                   AND e.story_url IS NOT NULL AND e.story_url != ''
-                  {note_filter} {seccion_clause} {pais_clause}
+                  {seccion_clause} {pais_clause}
             )
             SELECT 
                 g.dimension_type,
                 g.dimension_value,
                 SUM(g.visits) as total_visits,
                 COUNT(DISTINCT g.article_url) as article_count
-            FROM `{TABLE_GEO_SOURCES}` g
+            FROM `{TABLE_GEO_MONTHLY}` g
             INNER JOIN urls_filtradas u ON g.article_url = u.story_url
-            WHERE g.event_date BETWEEN '{start_date}' AND '{end_date}'
+            WHERE g.month BETWEEN DATE_TRUNC(DATE(@start_date), MONTH) AND DATE_TRUNC(DATE(@end_date), MONTH)
             GROUP BY g.dimension_type, g.dimension_value
             HAVING total_visits > 0
             ORDER BY total_visits DESC
@@ -1191,106 +1286,100 @@ def load_geo_data(_client, start_date: str, end_date: str, email_filter: str = N
                 dimension_value,
                 SUM(visits) as total_visits,
                 COUNT(DISTINCT article_url) as article_count
-            FROM `{TABLE_GEO_SOURCES}`
-            WHERE event_date BETWEEN '{start_date}' AND '{end_date}'
+            FROM `{TABLE_GEO_MONTHLY}`
+            WHERE month BETWEEN DATE_TRUNC(DATE(@start_date), MONTH) AND DATE_TRUNC(DATE(@end_date), MONTH)
             GROUP BY dimension_type, dimension_value
             HAVING total_visits > 0
             ORDER BY total_visits DESC
             LIMIT 100
         """
     
+    params = _params_for(query, start_date=start_date, end_date=end_date,
+                         email=email_filter, seccion=seccion_filter,
+                         pais=pais_filter.upper() if pais_filter else None)
     try:
-        return _client.query(query).to_dataframe()
-    except:
+        return _df(_client, query, dtypes={'total_visits': 'int64', 'article_count': 'int32'}, **params)
+    except gcp_exceptions.GoogleAPIError as e:
+        st.error(f"Error cargando datos geográficos: {e}")
         return pd.DataFrame()
 
 
+_SQL_TOP_ARTICLES_PROJECTION = """
+    SELECT
+        url,
+        titulo,
+        seccion,
+        COALESCE(creador, '-') as creador,
+        COALESCE(publicador, '-') as publicador,
+        CASE
+            WHEN LOWER(COALESCE(fuente_produccion, '')) LIKE '%scribnews%' THEN 'Scribnews'
+            WHEN LOWER(COALESCE(fuente_produccion, '')) LIKE '%composer%' THEN 'Composer'
+            ELSE COALESCE(fuente_produccion, '-')
+        END as fuente,
+        COALESCE(visitas, 0) as visitas,
+        COALESCE(pageviews, 0) as pageviews,
+        ROUND(COALESCE(scroll_promedio, 0), 2) as scroll_promedio,
+        COALESCE(palabras_titulo, 0) as palabras_titulo,
+        COALESCE(palabras_body, 0) as palabras_body
+    FROM base
+    ORDER BY COALESCE(visitas, 0) DESC
+"""
+
 @st.cache_data(ttl=3600, show_spinner=False)
+@persistent_cache(ttl=3600)
 def load_top_articles(_client, start_date: str, end_date: str, limit: int = 100, email_filter: str = None, seccion_filter: str = None, pais_filter: str = None) -> pd.DataFrame:
     """
     Carga top artículos. Usa lógica de PRIMER_SAVE como creador.
     """
-    seccion_clause = f"AND g.section = '{seccion_filter}'" if seccion_filter else ""
-    pais_clause = f"AND UPPER(a.country) = UPPER('{pais_filter}')" if pais_filter else ""
-    join_authors = f"LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(g.creator_email) = LOWER(a.email)" if pais_filter else ""
+    seccion_clause = "AND g.section = @seccion" if seccion_filter else ""
+    pais_clause = "AND a.country_upper = @pais" if pais_filter else ""
+    join_authors = f"LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(g.creator_email) = a.email_lower" if pais_filter else ""
     
     if email_filter:
         # Query especial para email_filter: muestra TODAS las notas del usuario (incluso sin tráfico)
+        # El set de notas del usuario se materializa una vez en scratch y lo
+        # comparten las tres queries con filtro de email del pageload
+        notes_table = materialize_user_notes(_client, email_filter, start_date, end_date)
         query = f"""
-            WITH notas_create AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}' AND action_type = 'CREATE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            notas_publish AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}' AND action_type = 'FIRST_PUBLISH'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            primer_save AS (
-                SELECT note_id, email_editor, ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                FROM `{TABLE_EDITORIAL}` WHERE action_type = 'SAVE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            notas_con_create AS (SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'),
-            notas_primer_save AS (
-                SELECT ps.note_id FROM primer_save ps
-                WHERE ps.rn = 1 AND ps.email_editor = '{email_filter}'
-                  AND ps.note_id NOT IN (SELECT note_id FROM notas_con_create)
-            ),
-            todas_notas_usuario AS (
-                SELECT note_id FROM notas_create UNION DISTINCT
-                SELECT note_id FROM notas_publish UNION DISTINCT
-                SELECT note_id FROM notas_primer_save
-            ),
-            notas_publicadas AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE action_type = 'FIRST_PUBLISH' AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            notas_usuario_pub AS (
-                SELECT DISTINCT t.note_id FROM todas_notas_usuario t
-                INNER JOIN notas_publicadas p ON t.note_id = p.note_id
+            WITH notas_usuario_pub AS (
+                SELECT note_id FROM `{notes_table}` WHERE is_published
             ),
             urls_notas AS (
-                SELECT DISTINCT e.note_id, e.story_url FROM `{TABLE_EDITORIAL}` e
-                WHERE e.note_id IN (SELECT note_id FROM notas_usuario_pub)
-                  AND e.story_url IS NOT NULL
+                SELECT note_id, story_url FROM `{notes_table}`
+                WHERE is_published AND story_url IS NOT NULL
             ),
-            -- Calcular el creador real: CREATE si existe, si no PRIMER_SAVE
-            creadores_create AS (
-                SELECT note_id, email_editor as creador_email
+            -- Agregar metadata por nota ANTES de joinear: el join con el
+            -- historial editorial explotaba a todos los eventos por nota
+            -- y recién después colapsaba con ANY_VALUE
+            editorial_meta AS (
+                SELECT
+                    note_id,
+                    ANY_VALUE(title) as titulo,
+                    ANY_VALUE(segment) as seccion,
+                    ANY_VALUE(CASE WHEN action_type = 'FIRST_PUBLISH' THEN email_editor END) as publicador,
+                    ANY_VALUE(source) as fuente_produccion,
+                    ANY_VALUE(title_word_count) as palabras_titulo,
+                    ANY_VALUE(body_word_count) as palabras_body
                 FROM `{TABLE_EDITORIAL}`
-                WHERE action_type = 'CREATE'
-            ),
-            primer_save_all AS (
-                SELECT note_id, email_editor, ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                FROM `{TABLE_EDITORIAL}` WHERE action_type = 'SAVE'
-            ),
-            creadores_primer_save AS (
-                SELECT ps.note_id, ps.email_editor as creador_email
-                FROM primer_save_all ps
-                WHERE ps.rn = 1 AND ps.note_id NOT IN (SELECT note_id FROM creadores_create)
-            ),
-            creadores_reales AS (
-                SELECT note_id, creador_email FROM creadores_create
-                UNION ALL
-                SELECT note_id, creador_email FROM creadores_primer_save
+                WHERE note_id IN (SELECT note_id FROM notas_usuario_pub)
+                  AND event_timestamp >= TIMESTAMP(DATE_SUB(DATE(@start_date), INTERVAL 30 DAY))
+                  AND event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
+                GROUP BY note_id
             ),
             metadata_notas AS (
-                SELECT 
+                SELECT
                     u.note_id,
                     u.story_url as url,
-                    ANY_VALUE(e.title) as titulo,
-                    ANY_VALUE(e.segment) as seccion,
-                    ANY_VALUE(cr.creador_email) as creador,
-                    ANY_VALUE(CASE WHEN e.action_type = 'FIRST_PUBLISH' THEN e.email_editor END) as publicador,
-                    ANY_VALUE(e.source) as fuente_produccion,
-                    ANY_VALUE(e.title_word_count) as palabras_titulo,
-                    ANY_VALUE(e.body_word_count) as palabras_body
+                    em.titulo,
+                    em.seccion,
+                    cr.creador_email as creador,
+                    em.publicador,
+                    em.fuente_produccion,
+                    em.palabras_titulo,
+                    em.palabras_body
                 FROM urls_notas u
-                LEFT JOIN `{TABLE_EDITORIAL}` e ON u.note_id = e.note_id
-                LEFT JOIN creadores_reales cr ON u.note_id = cr.note_id
-                GROUP BY u.note_id, u.story_url
+                LEFT JOIN editorial_meta em ON u.note_id = em.note_id
+                LEFT JOIN `{TABLE_NOTE_ROLES}` cr ON u.note_id = cr.note_id
             ),
             trafico AS (
                 SELECT
@@ -1298,32 +1387,23 @@ def load_top_articles(_client, start_date: str, end_date: str, limit: int = 100,
                     SUM(g.visits) as visitas,
                     SUM(g.pageviews) as pageviews,
                     SAFE_DIVIDE(SUM(g.scrolls), SUM(g.visits)) as scroll_promedio
-                FROM `{TABLE_PRODUCTIVITY}` g
-                WHERE g.date BETWEEN '{start_date}' AND '{end_date}'
+                FROM `{TABLE_STORY_TRAFFIC}` g
+                WHERE g.date BETWEEN DATE(@start_date) AND DATE(@end_date)
                   AND g.article_url IN (SELECT story_url FROM urls_notas)
                 GROUP BY g.article_url
+            ),
+            base AS (
+                SELECT
+                    m.url, m.titulo, m.seccion, m.creador, m.publicador,
+                    m.fuente_produccion, t.visitas, t.pageviews, t.scroll_promedio,
+                    m.palabras_titulo, m.palabras_body
+                FROM metadata_notas m
+                LEFT JOIN trafico t ON m.url = t.url
+                WHERE m.titulo IS NOT NULL AND m.titulo != ''
+                ORDER BY COALESCE(t.visitas, 0) DESC
+                LIMIT @limit
             )
-            SELECT
-                m.url,
-                m.titulo,
-                m.seccion,
-                COALESCE(m.creador, '-') as creador,
-                COALESCE(m.publicador, '-') as publicador,
-                CASE 
-                    WHEN LOWER(COALESCE(m.fuente_produccion, '')) LIKE '%scribnews%' THEN 'Scribnews'
-                    WHEN LOWER(COALESCE(m.fuente_produccion, '')) LIKE '%composer%' THEN 'Composer'
-                    ELSE COALESCE(m.fuente_produccion, '-')
-                END as fuente,
-                COALESCE(t.visitas, 0) as visitas,
-                COALESCE(t.pageviews, 0) as pageviews,
-                ROUND(COALESCE(t.scroll_promedio, 0), 2) as scroll_promedio,
-                COALESCE(m.palabras_titulo, 0) as palabras_titulo,
-                COALESCE(m.palabras_body, 0) as palabras_body
-            FROM metadata_notas m
-            LEFT JOIN trafico t ON m.url = t.url
-            WHERE m.titulo IS NOT NULL AND m.titulo != ''
-            ORDER BY COALESCE(t.visitas, 0) DESC
-            LIMIT {limit}
+            {_SQL_TOP_ARTICLES_PROJECTION}
         """
     else:
         query = f"""
@@ -1339,8 +1419,8 @@ def load_top_articles(_client, start_date: str, end_date: str, limit: int = 100,
                     SAFE_DIVIDE(SUM(g.scrolls), SUM(g.visits)) as scroll_promedio
                 FROM `{TABLE_PRODUCTIVITY}` g
                 {join_authors}
-                WHERE g.date BETWEEN '{start_date}' AND '{end_date}'
-                  AND DATE(g.publish_date) BETWEEN '{start_date}' AND '{end_date}'
+                WHERE g.date BETWEEN DATE(@start_date) AND DATE(@end_date)
+                  AND DATE(g.publish_date) BETWEEN DATE(@start_date) AND DATE(@end_date)
                   {seccion_clause} {pais_clause}
                 GROUP BY g.article_url
             ),
@@ -1352,185 +1432,132 @@ def load_top_articles(_client, start_date: str, end_date: str, limit: int = 100,
                     ANY_VALUE(body_word_count) as palabras_body
                 FROM `{TABLE_EDITORIAL}`
                 WHERE action_type = 'FIRST_PUBLISH'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
+                  AND event_timestamp >= TIMESTAMP(@start_date) AND event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
                 GROUP BY story_url
+            ),
+            base AS (
+                SELECT
+                    t.url, t.titulo, t.seccion, t.creador, p.publicador,
+                    t.fuente_produccion, t.visitas, t.pageviews, t.scroll_promedio,
+                    p.palabras_titulo, p.palabras_body
+                FROM trafico t
+                LEFT JOIN publicadores p ON t.url = p.url
+                WHERE t.titulo IS NOT NULL
+                  AND t.titulo != ''
+                  AND LOWER(t.titulo) NOT LIKE '%hacemos periodismo%'
+                  AND LOWER(t.titulo) NOT LIKE '%infobae américa - infobae%'
+                  AND LOWER(t.titulo) NOT LIKE '%infobae america - infobae%'
+                  AND LOWER(t.url) NOT LIKE '%/homepage%'
+                  AND t.seccion IS NOT NULL
+                ORDER BY t.visitas DESC
+                LIMIT @limit
             )
-            SELECT
-                t.url,
-                t.titulo,
-                t.seccion,
-                COALESCE(t.creador, '-') as creador,
-                COALESCE(p.publicador, '-') as publicador,
-                CASE 
-                    WHEN LOWER(t.fuente_produccion) LIKE '%scribnews%' THEN 'Scribnews'
-                    WHEN LOWER(t.fuente_produccion) LIKE '%composer%' THEN 'Composer'
-                    ELSE COALESCE(t.fuente_produccion, '-')
-                END as fuente,
-                t.visitas,
-                t.pageviews,
-                ROUND(COALESCE(t.scroll_promedio, 0), 2) as scroll_promedio,
-                COALESCE(p.palabras_titulo, 0) as palabras_titulo,
-                COALESCE(p.palabras_body, 0) as palabras_body
-            FROM trafico t
-            LEFT JOIN publicadores p ON t.url = p.url
-            WHERE t.titulo IS NOT NULL 
-              AND t.titulo != ''
-              AND LOWER(t.titulo) NOT LIKE '%hacemos periodismo%'
-              AND LOWER(t.titulo) NOT LIKE '%infobae américa - infobae%'
-              AND LOWER(t.titulo) NOT LIKE '%infobae america - infobae%'
-              AND LOWER(t.url) NOT LIKE '%/homepage%'
-              AND t.seccion IS NOT NULL
-            ORDER BY t.visitas DESC
-            LIMIT {limit}
+            {_SQL_TOP_ARTICLES_PROJECTION}
         """
+    params = _params_for(query, start_date=start_date, end_date=end_date,
+                         email=email_filter, seccion=seccion_filter,
+                         pais=pais_filter.upper() if pais_filter else None,
+                         limit=limit)
     try:
-        return _client.query(query).to_dataframe()
+        df = _df(_client, query, **params)
     except Exception as e:
         st.error(f"Error cargando artículos: {e}")
         return pd.DataFrame()
+    if df.empty:
+        return df
+    # dtypes compactos: category para strings repetidos, enteros angostos para
+    # contadores; achica ~4x la copia que guarda st.cache_data
+    return df.astype({'seccion': 'category', 'creador': 'category', 'publicador': 'category',
+                      'fuente': 'category', 'visitas': 'int32', 'pageviews': 'int32',
+                      'scroll_promedio': 'float32', 'palabras_titulo': 'int32',
+                      'palabras_body': 'int32'})
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
+@persistent_cache(ttl=3600)
 def get_last_data_date(_client) -> tuple:
     """
     Obtiene la última fecha con datos disponibles en la tabla Gold.
     Retorna (fecha_formateada, objeto_date) o (None, None) si no hay datos.
     """
+    # La fecha de hoy se bindea desde Python: CURRENT_DATE() en el SQL
+    # invalida el results cache de BigQuery; con el parámetro estable el
+    # mismo job se sirve de caché durante todo el día
     query = f"""
         SELECT MAX(date) as ultima_fecha
         FROM `{TABLE_PRODUCTIVITY}`
+        WHERE date >= DATE_SUB(DATE(@hoy), INTERVAL 14 DAY)
     """
     try:
-        df = _client.query(query).to_dataframe()
-        if not df.empty and df.iloc[0]['ultima_fecha'] is not None:
-            fecha = df.iloc[0]['ultima_fecha']
+        row = _scalar_row(_client, query, hoy=datetime.utcnow().date().isoformat())
+        if row is not None and row['ultima_fecha'] is not None:
+            fecha = row['ultima_fecha']
             # Convertir a date si es datetime
             if hasattr(fecha, 'date'):
                 fecha_date = fecha.date()
             else:
                 fecha_date = fecha
             return (fecha_date.strftime('%d/%m/%Y'), fecha_date)
-    except:
+    except gcp_exceptions.GoogleAPIError:
         pass
     return (None, None)
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@st.cache_resource(ttl=3600, show_spinner=False)
+@persistent_cache(ttl=3600)
 def load_filter_options(_client, start_date: str, end_date: str) -> dict:
-    """Carga opciones para filtros (emails de creadores/publicadores y secciones)."""
-    # Emails de creadores y publicadores con nombres (LEFT JOIN con autores)
-    query_emails = f"""
-        SELECT DISTINCT 
-            e.email_editor,
-            COALESCE(a.complete_name, e.email_editor) as display_name,
-            a.country
-        FROM `{TABLE_EDITORIAL}` e
-        LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(e.email_editor) = LOWER(a.email)
-        WHERE e.action_type IN ('CREATE', 'FIRST_PUBLISH')
-          AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-          AND e.email_editor IS NOT NULL AND e.email_editor != ''
-        ORDER BY display_name
-    """
-    
-    # Secciones desde arc_editorial_activity
-    query_secciones = f"""
-        SELECT DISTINCT segment
-        FROM `{TABLE_EDITORIAL}`
-        WHERE action_type = 'FIRST_PUBLISH'
-          AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-          AND segment IS NOT NULL AND segment != ''
-        ORDER BY segment
     """
-    
-    # Países únicos desde la tabla de autores
-    query_paises = f"""
-        SELECT DISTINCT a.country
-        FROM `{TABLE_AUTHORS}` a
-        INNER JOIN (
-            SELECT DISTINCT email_editor
-            FROM `{TABLE_EDITORIAL}`
-            WHERE action_type IN ('CREATE', 'FIRST_PUBLISH')
-              AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-              AND email_editor IS NOT NULL AND email_editor != ''
-        ) e ON LOWER(a.email) = LOWER(e.email_editor)
-        WHERE a.country IS NOT NULL AND a.country != ''
-        ORDER BY a.country
+    Carga opciones para filtros (emails, secciones y países) en una sola
+    query etiquetada por tipo: un job en vez de tres RPCs que repetían el
+    mismo scan editorial. Devuelve dicts/listas planas compartidas entre
+    sesiones, por eso cache_resource en vez de cache_data (sin copia
+    defensiva por rerun).
     """
-    
     try:
-        df_emails = _client.query(query_emails).to_dataframe()
-        # Crear diccionario {display_name: email} para el dropdown
-        email_options = {}
-        for _, row in df_emails.iterrows():
-            email = row['email_editor']
-            display = row['display_name']
-            if email and display:
-                email_options[display] = email
-        # Ordenar por nombre
-        email_options = dict(sorted(email_options.items()))
-    except:
-        email_options = {}
-    
-    try:
-        df_secciones = _client.query(query_secciones).to_dataframe()
-        secciones = sorted([s for s in df_secciones['segment'].dropna().unique() if s.strip()])
-    except:
-        secciones = []
-    
-    try:
-        df_paises = _client.query(query_paises).to_dataframe()
-        paises = sorted([p for p in df_paises['country'].dropna().unique() if p.strip()])
-    except:
-        paises = []
-    
-    return {'email_options': email_options, 'secciones': secciones, 'paises': paises}
+        # Arrow directo a listas de Python: el resultado son dicts/listas,
+        # armar un DataFrame intermedio solo agrega allocaciones
+        tabla = _rows(_client, _SQL_FILTER_OPTIONS, start_date=start_date, end_date=end_date).to_arrow()
+    except gcp_exceptions.GoogleAPIError:
+        return {'email_options': {}, 'email_display_options': ['Todos'],
+                'secciones': [], 'secciones_options': ['Todas'],
+                'paises': [], 'paises_options': ['Todos']}
+
+    tipos = tabla.column('tipo').to_pylist()
+    valores = tabla.column('valor').to_pylist()
+    etiquetas = tabla.column('etiqueta').to_pylist()
+
+    email_options = dict(sorted(
+        (etiqueta, valor) for tipo, valor, etiqueta in zip(tipos, valores, etiquetas)
+        if tipo == 'email' and valor and etiqueta
+    ))
+    secciones = sorted({v for t, v in zip(tipos, valores) if t == 'seccion' and v and v.strip()})
+    paises = sorted({v for t, v in zip(tipos, valores) if t == 'pais' and v and v.strip()})
+    # Las listas con 'Todos'/'Todas' prepend se arman acá una sola vez; el
+    # sidebar las usa directo sin concatenar listas en cada rerun
+    return {'email_options': email_options,
+            'email_display_options': ['Todos'] + list(email_options),
+            'secciones': secciones,
+            'secciones_options': ['Todas'] + secciones,
+            'paises': paises,
+            'paises_options': ['Todos'] + paises}
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
+@persistent_cache(ttl=3600)
 def load_source_efficiency(_client, start_date: str, end_date: str, email_filter: str = None, seccion_filter: str = None, pais_filter: str = None) -> pd.DataFrame:
     """
     Carga métricas de eficiencia por fuente de producción.
     Usa lógica de PRIMER_SAVE como creador.
     """
-    seccion_clause = f"AND e.segment = '{seccion_filter}'" if seccion_filter else ""
-    pais_clause = f"AND UPPER(a.country) = UPPER('{pais_filter}')" if pais_filter else ""
-    join_authors = f"LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(e.email_editor) = LOWER(a.email)" if pais_filter else ""
+    seccion_clause = "AND e.segment = @seccion" if seccion_filter else ""
+    pais_clause = "AND a.country_upper = @pais" if pais_filter else ""
+    join_authors = f"LEFT JOIN `{TABLE_AUTHORS}` a ON e.email_editor_lower = a.email_lower" if pais_filter else ""
     
     if email_filter:
+        notes_table = materialize_user_notes(_client, email_filter, start_date, end_date)
         email_cte = f"""
-            notas_create AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}' AND action_type = 'CREATE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            notas_publish AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE email_editor = '{email_filter}' AND action_type = 'FIRST_PUBLISH'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            primer_save AS (
-                SELECT note_id, email_editor, ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                FROM `{TABLE_EDITORIAL}` WHERE action_type = 'SAVE'
-                  AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
-            notas_con_create AS (SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'),
-            notas_primer_save AS (
-                SELECT ps.note_id FROM primer_save ps
-                WHERE ps.rn = 1 AND ps.email_editor = '{email_filter}'
-                  AND ps.note_id NOT IN (SELECT note_id FROM notas_con_create)
-            ),
-            todas_notas_usuario AS (
-                SELECT note_id FROM notas_create UNION DISTINCT
-                SELECT note_id FROM notas_publish UNION DISTINCT
-                SELECT note_id FROM notas_primer_save
-            ),
-            notas_publicadas AS (
-                SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                WHERE action_type = 'FIRST_PUBLISH' AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-            ),
             notas_usuario_publicadas AS (
-                SELECT t.note_id FROM todas_notas_usuario t
-                INNER JOIN notas_publicadas p ON t.note_id = p.note_id
+                SELECT note_id FROM `{notes_table}` WHERE is_published
             ),
         """
         email_filter_clause = "AND e.note_id IN (SELECT note_id FROM notas_usuario_publicadas)"
@@ -1547,14 +1574,14 @@ def load_source_efficiency(_client, start_date: str, end_date: str, email_filter
                     e.note_id,
                     e.story_url,
                     CASE 
-                        WHEN LOWER(e.email_editor) = 'infobae' THEN 'Agencias'
+                        WHEN e.email_editor_lower = 'infobae' THEN 'Agencias'
                         WHEN LOWER(COALESCE(e.source, '')) LIKE '%scribnews%' THEN 'Scribnews'
                         WHEN LOWER(COALESCE(e.source, '')) LIKE '%composer%' THEN 'Composer'
                         ELSE 'Otros'
                     END as fuente
                 FROM `{TABLE_EDITORIAL}` e
                 WHERE e.action_type = 'FIRST_PUBLISH'
-                  AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
+                  AND e.event_timestamp >= TIMESTAMP(@start_date) AND e.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
                   {email_filter_clause} {seccion_clause}
             ),
             metricas AS (
@@ -1567,7 +1594,7 @@ def load_source_efficiency(_client, start_date: str, end_date: str, email_filter
                     SAFE_DIVIDE(SUM(g.total_engagement_seconds), SUM(g.daily_sessions)) / 60 as tiempo_promedio_min
                 FROM notas_por_fuente n
                 LEFT JOIN `{TABLE_PRODUCTIVITY_SILVER}` g ON n.story_url = g.article_url
-                    AND g.event_date BETWEEN '{start_date}' AND '{end_date}'
+                    AND g.event_date BETWEEN DATE(@start_date) AND DATE(@end_date)
                 GROUP BY n.fuente
             )
             SELECT 
@@ -1589,7 +1616,7 @@ def load_source_efficiency(_client, start_date: str, end_date: str, email_filter
                     e.note_id,
                     e.story_url,
                     CASE 
-                        WHEN LOWER(e.email_editor) = 'infobae' THEN 'Agencias'
+                        WHEN e.email_editor_lower = 'infobae' THEN 'Agencias'
                         WHEN LOWER(COALESCE(e.source, '')) LIKE '%scribnews%' THEN 'Scribnews'
                         WHEN LOWER(COALESCE(e.source, '')) LIKE '%composer%' THEN 'Composer'
                         ELSE 'Otros'
@@ -1597,7 +1624,7 @@ def load_source_efficiency(_client, start_date: str, end_date: str, email_filter
                 FROM `{TABLE_EDITORIAL}` e
                 {join_authors}
                 WHERE e.action_type = 'FIRST_PUBLISH'
-                  AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
+                  AND e.event_timestamp >= TIMESTAMP(@start_date) AND e.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
                   {seccion_clause} {pais_clause}
             ),
             metricas AS (
@@ -1610,7 +1637,7 @@ def load_source_efficiency(_client, start_date: str, end_date: str, email_filter
                     SAFE_DIVIDE(SUM(g.total_time_seconds), SUM(g.visits)) / 60 as tiempo_promedio_min
                 FROM notas_por_fuente n
                 LEFT JOIN `{TABLE_PRODUCTIVITY}` g ON n.story_url = g.article_url
-                    AND g.date BETWEEN '{start_date}' AND '{end_date}'
+                    AND g.date BETWEEN DATE(@start_date) AND DATE(@end_date)
                 GROUP BY n.fuente
             )
             SELECT 
@@ -1625,14 +1652,22 @@ def load_source_efficiency(_client, start_date: str, end_date: str, email_filter
             WHERE fuente != 'Otros'
             ORDER BY sesiones DESC
         """
+    params = _params_for(query, start_date=start_date, end_date=end_date,
+                         email=email_filter, seccion=seccion_filter,
+                         pais=pais_filter.upper() if pais_filter else None)
     try:
-        return _client.query(query).to_dataframe()
+        df = _df(_client, query, **params)
     except Exception as e:
         st.error(f"Error cargando eficiencia por fuente: {e}")
         return pd.DataFrame()
+    if df.empty:
+        return df
+    return df.astype({'fuente': 'category', 'notas': 'int32',
+                      'scroll_promedio': 'float32', 'tiempo_promedio_min': 'float32'})
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
+@persistent_cache(ttl=3600)
 def load_author_productivity(_client, start_date: str, end_date: str, email_filter: str = None, seccion_filter: str = None, pais_filter: str = None, metric_type: str = "created") -> pd.DataFrame:
     """
     Carga datos de productividad por autor para scatter plot.
@@ -1642,46 +1677,16 @@ def load_author_productivity(_client, start_date: str, end_date: str, email_filt
     - published: muestra QUIÉN PUBLICÓ las notas del usuario
     - participated: muestra al usuario con todas sus notas
     """
-    seccion_clause = f"AND e.segment = '{seccion_filter}'" if seccion_filter else ""
-    pais_clause = f"AND UPPER(a.country) = UPPER('{pais_filter}')" if pais_filter else ""
+    pais_clause = "AND a.country_upper = @pais" if pais_filter else ""
     min_notas = 1 if email_filter else 3
     
-    if metric_type == "created":
-        action_types = "('CREATE')"
-    elif metric_type == "published":
-        action_types = "('FIRST_PUBLISH')"
-    else:
-        action_types = "('CREATE', 'FIRST_PUBLISH')"
-    
     if email_filter:
+        notes_table = materialize_user_notes(_client, email_filter, start_date, end_date)
         if metric_type == "published":
             # Mostrar QUIÉN PUBLICÓ las notas del usuario
             query = f"""
-                WITH notas_create AS (
-                    SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                    WHERE email_editor = '{email_filter}' AND action_type = 'CREATE'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                ),
-                notas_publish AS (
-                    SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                    WHERE email_editor = '{email_filter}' AND action_type = 'FIRST_PUBLISH'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                ),
-                primer_save AS (
-                    SELECT note_id, email_editor, ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                    FROM `{TABLE_EDITORIAL}` WHERE action_type = 'SAVE'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                ),
-                notas_con_create AS (SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'),
-                notas_primer_save AS (
-                    SELECT ps.note_id FROM primer_save ps
-                    WHERE ps.rn = 1 AND ps.email_editor = '{email_filter}'
-                      AND ps.note_id NOT IN (SELECT note_id FROM notas_con_create)
-                ),
-                todas_notas_usuario AS (
-                    SELECT note_id FROM notas_create UNION DISTINCT
-                    SELECT note_id FROM notas_publish UNION DISTINCT
-                    SELECT note_id FROM notas_primer_save
+                WITH todas_notas_usuario AS (
+                    SELECT note_id FROM `{notes_table}`
                 ),
                 -- Publicadores de las notas del usuario con sus métricas
                 publicadores AS (
@@ -1691,19 +1696,19 @@ def load_author_productivity(_client, start_date: str, end_date: str, email_filt
                         COALESCE(a.country, 'Desconocido') as pais,
                         COUNT(DISTINCT e.note_id) as notas
                     FROM `{TABLE_EDITORIAL}` e
-                    LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(e.email_editor) = LOWER(a.email)
+                    LEFT JOIN `{TABLE_AUTHORS}` a ON e.email_editor_lower = a.email_lower
                     WHERE e.action_type = 'FIRST_PUBLISH'
-                      AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
+                      AND e.event_timestamp >= TIMESTAMP(@start_date) AND e.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
                       AND e.note_id IN (SELECT note_id FROM todas_notas_usuario)
                       AND e.email_editor IS NOT NULL AND e.email_editor != ''
-                      AND LOWER(e.email_editor) != 'infobae'
+                      AND e.email_editor_lower != 'infobae'
                     GROUP BY e.email_editor, autor, pais
                 ),
                 notas_publicador AS (
                     SELECT DISTINCT e.email_editor, e.story_url
                     FROM `{TABLE_EDITORIAL}` e
                     WHERE e.action_type = 'FIRST_PUBLISH'
-                      AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
+                      AND e.event_timestamp >= TIMESTAMP(@start_date) AND e.event_timestamp < TIMESTAMP_ADD(TIMESTAMP(@end_date), INTERVAL 1 DAY)
                       AND e.note_id IN (SELECT note_id FROM todas_notas_usuario)
                       AND e.story_url IS NOT NULL
                 ),
@@ -1714,7 +1719,7 @@ def load_author_productivity(_client, start_date: str, end_date: str, email_filt
                         SAFE_DIVIDE(SUM(g.sessions_with_scroll), SUM(g.daily_sessions)) as scroll_promedio
                     FROM notas_publicador np
                     INNER JOIN `{TABLE_PRODUCTIVITY_SILVER}` g ON np.story_url = g.article_url
-                    WHERE g.event_date BETWEEN '{start_date}' AND '{end_date}'
+                    WHERE g.event_date BETWEEN DATE(@start_date) AND DATE(@end_date)
                     GROUP BY np.email_editor
                 )
                 SELECT 
@@ -1732,51 +1737,19 @@ def load_author_productivity(_client, start_date: str, end_date: str, email_filt
         else:
             # created o participated: mostrar al usuario con sus notas
             query = f"""
-                WITH notas_create AS (
-                    SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                    WHERE email_editor = '{email_filter}' AND action_type = 'CREATE'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                ),
-                notas_publish AS (
-                    SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                    WHERE email_editor = '{email_filter}' AND action_type = 'FIRST_PUBLISH'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                ),
-                primer_save AS (
-                    SELECT note_id, email_editor, ROW_NUMBER() OVER (PARTITION BY note_id ORDER BY event_timestamp) as rn
-                    FROM `{TABLE_EDITORIAL}` WHERE action_type = 'SAVE'
-                      AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                ),
-                notas_con_create AS (SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}` WHERE action_type = 'CREATE'),
-                notas_primer_save AS (
-                    SELECT ps.note_id FROM primer_save ps
-                    WHERE ps.rn = 1 AND ps.email_editor = '{email_filter}'
-                      AND ps.note_id NOT IN (SELECT note_id FROM notas_con_create)
-                ),
-                todas_notas_usuario AS (
-                    SELECT note_id FROM notas_create UNION DISTINCT
-                    SELECT note_id FROM notas_publish UNION DISTINCT
-                    SELECT note_id FROM notas_primer_save
-                ),
-                notas_publicadas AS (
-                    SELECT DISTINCT note_id FROM `{TABLE_EDITORIAL}`
-                    WHERE action_type = 'FIRST_PUBLISH' AND DATE(event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                ),
-                notas_usuario_pub AS (
-                    SELECT DISTINCT t.note_id FROM todas_notas_usuario t
-                    INNER JOIN notas_publicadas p ON t.note_id = p.note_id
+                WITH notas_usuario_pub AS (
+                    SELECT note_id FROM `{notes_table}` WHERE is_published
                 ),
                 urls_usuario AS (
-                    SELECT DISTINCT e.story_url FROM `{TABLE_EDITORIAL}` e
-                    WHERE e.note_id IN (SELECT note_id FROM notas_usuario_pub)
-                      AND e.story_url IS NOT NULL
+                    SELECT story_url FROM `{notes_table}`
+                    WHERE is_published AND story_url IS NOT NULL
                 ),
                 info_autor AS (
                     SELECT 
-                        COALESCE(a.complete_name, '{email_filter}') as autor,
+                        COALESCE(a.complete_name, @email) as autor,
                         COALESCE(a.country, 'Desconocido') as pais
                     FROM `{TABLE_AUTHORS}` a
-                    WHERE LOWER(a.email) = LOWER('{email_filter}')
+                    WHERE a.email_lower = LOWER(@email)
                 ),
                 trafico AS (
                     SELECT 
@@ -1784,10 +1757,10 @@ def load_author_productivity(_client, start_date: str, end_date: str, email_filt
                         SAFE_DIVIDE(SUM(g.sessions_with_scroll), SUM(g.daily_sessions)) as scroll_promedio
                     FROM `{TABLE_PRODUCTIVITY_SILVER}` g
                     WHERE g.article_url IN (SELECT story_url FROM urls_usuario)
-                      AND g.event_date BETWEEN '{start_date}' AND '{end_date}'
+                      AND g.event_date BETWEEN DATE(@start_date) AND DATE(@end_date)
                 )
                 SELECT 
-                    COALESCE((SELECT autor FROM info_autor LIMIT 1), '{email_filter}') as autor,
+                    COALESCE((SELECT autor FROM info_autor LIMIT 1), @email) as autor,
                     COALESCE((SELECT pais FROM info_autor LIMIT 1), 'Desconocido') as pais,
                     (SELECT COUNT(*) FROM notas_usuario_pub) as notas_creadas,
                     COALESCE((SELECT sesiones_totales FROM trafico), 0) as sesiones_totales,
@@ -1795,58 +1768,38 @@ def load_author_productivity(_client, start_date: str, end_date: str, email_filt
                     SAFE_DIVIDE(COALESCE((SELECT sesiones_totales FROM trafico), 0), (SELECT COUNT(*) FROM notas_usuario_pub)) as eficiencia
             """
     else:
+        sufijo = {"created": "creadas", "published": "publicadas"}.get(metric_type, "participadas")
+        col_notas = f"notas_{sufijo}"
+        col_visits = f"visits_{sufijo}"
+        col_scrolls = f"scrolls_{sufijo}"
+        seccion_clause_daily = "AND p.segment = @seccion" if seccion_filter else ""
         query = f"""
-            WITH autores AS (
-                SELECT 
-                    e.email_editor,
-                    COALESCE(a.complete_name, e.email_editor) as autor,
-                    COALESCE(a.country, 'Desconocido') as pais,
-                    COUNT(DISTINCT e.note_id) as notas
-                FROM `{TABLE_EDITORIAL}` e
-                LEFT JOIN `{TABLE_AUTHORS}` a ON LOWER(e.email_editor) = LOWER(a.email)
-                WHERE e.action_type IN {action_types}
-                  AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                  AND e.email_editor IS NOT NULL 
-                  AND e.email_editor != ''
-                  AND LOWER(e.email_editor) != 'infobae'
-                  {seccion_clause} {pais_clause}
-                GROUP BY e.email_editor, autor, pais
-                HAVING notas >= {min_notas}
-            ),
-            notas_autor AS (
-                SELECT DISTINCT 
-                    e.email_editor,
-                    e.story_url
-                FROM `{TABLE_EDITORIAL}` e
-                WHERE e.action_type IN {action_types}
-                  AND DATE(e.event_timestamp) BETWEEN '{start_date}' AND '{end_date}'
-                  AND e.story_url IS NOT NULL
-            ),
-            trafico_por_autor AS (
-                SELECT 
-                    na.email_editor,
-                    SUM(g.visits) as sesiones_totales,
-                    SAFE_DIVIDE(SUM(g.scrolls), SUM(g.visits)) as scroll_promedio
-                FROM notas_autor na
-                INNER JOIN `{TABLE_PRODUCTIVITY}` g ON na.story_url = g.article_url
-                WHERE g.date BETWEEN '{start_date}' AND '{end_date}'
-                GROUP BY na.email_editor
-            )
-            SELECT 
-                a.autor,
-                a.pais,
-                a.notas as notas_creadas,
-                COALESCE(t.sesiones_totales, 0) as sesiones_totales,
-                COALESCE(t.scroll_promedio, 0) as scroll_promedio,
-                SAFE_DIVIDE(COALESCE(t.sesiones_totales, 0), a.notas) as eficiencia
-            FROM autores a
-            LEFT JOIN trafico_por_autor t ON a.email_editor = t.email_editor
-            WHERE COALESCE(t.sesiones_totales, 0) > 0
+            SELECT
+                COALESCE(a.complete_name, p.email_editor) as autor,
+                COALESCE(a.country, 'Desconocido') as pais,
+                SUM(p.{col_notas}) as notas_creadas,
+                SUM(p.{col_visits}) as sesiones_totales,
+                COALESCE(SAFE_DIVIDE(SUM(p.{col_scrolls}), SUM(p.{col_visits})), 0) as scroll_promedio,
+                SAFE_DIVIDE(SUM(p.{col_visits}), SUM(p.{col_notas})) as eficiencia
+            FROM `{TABLE_AUTHOR_DAILY}` p
+            LEFT JOIN `{TABLE_AUTHORS}` a ON p.email_editor_lower = a.email_lower
+            WHERE p.date BETWEEN DATE(@start_date) AND DATE(@end_date)
+              {seccion_clause_daily} {pais_clause}
+            GROUP BY p.email_editor, autor, pais
+            HAVING notas_creadas >= @min_notas AND sesiones_totales > 0
             ORDER BY sesiones_totales DESC
             LIMIT 100
         """
+    params = _params_for(query, start_date=start_date, end_date=end_date,
+                         email=email_filter, seccion=seccion_filter,
+                         pais=pais_filter.upper() if pais_filter else None,
+                         min_notas=min_notas)
     try:
-        return _client.query(query).to_dataframe()
+        df = _df(_client, query, **params)
+        if not df.empty:
+            df = df.astype({'autor': 'category', 'pais': 'category', 'notas_creadas': 'int32',
+                            'scroll_promedio': 'float32', 'eficiencia': 'float32'})
+        return df
     except Exception as e:
         st.error(f"Error cargando productividad por autor: {e}")
         return pd.DataFrame()
@@ -1856,16 +1809,26 @@ def load_author_productivity(_client, start_date: str, end_date: str, email_filt
 # FUNCIONES DE RENDERIZADO
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def format_number(num: float) -> str:
-    """Formatea números grandes de forma legible."""
-    if pd.isna(num) or num is None:
-        return "0"
+@functools.lru_cache(maxsize=4096)
+def _fmt_num(num: int) -> str:
     if num >= 1_000_000:
         return f"{num/1_000_000:.1f}M"
     elif num >= 1_000:
         return f"{num/1_000:.1f}K"
     else:
-        return f"{num:,.0f}"
+        return f"{num:,}"
+
+
+def format_number(num: float) -> str:
+    """Formatea números grandes de forma legible.
+
+    Memoizado sobre el valor truncado a entero: los KPIs repiten los mismos
+    valores entre tarjetas y reruns, y a la resolución mostrada (1 decimal
+    en K/M) el decimal del input no cambia el output.
+    """
+    if num is None or pd.isna(num):
+        return "0"
+    return _fmt_num(int(num))
 
 
 def calculate_delta(current: float, previous: float) -> tuple:
@@ -1897,76 +1860,38 @@ def render_kpi_card(label: str, value: str, delta: float = None, delta_dir: str
 def render_kpis(kpis: dict, prev_kpis: dict):
     """Renderiza la sección de KPIs principales."""
     
-    # Fila superior - Volumen
+    # Cada st.markdown es un elemento que Streamlit serializa y envía al
+    # front por separado: las 10 tarjetas se concatenan en un solo markdown
+    # por fila (grid CSS) en vez de 10 columnas con una llamada cada una
     st.markdown("##### 📊 Volumen de Producción")
-    col1, col2, col3, col4, col5, col6 = st.columns(6)
-    
-    with col1:
-        st.markdown(render_kpi_card(
-            "Creadores", 
-            f"{kpis['creadores_activos']:,}"
-        ), unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(render_kpi_card(
-            "Publicadores", 
-            f"{kpis['publicadores_activos']:,}"
-        ), unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(render_kpi_card(
-            "Notas Publicadas", 
-            f"{kpis['notas_publicadas']:,}"
-        ), unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown(render_kpi_card(
-            "Sesiones Únicas", 
-            format_number(kpis['visitas_totales'])
-        ), unsafe_allow_html=True)
-    
-    with col5:
-        st.markdown(render_kpi_card(
-            "Usuarios Únicos", 
-            format_number(kpis.get('usuarios_unicos', 0))
-        ), unsafe_allow_html=True)
-    
-    with col6:
-        st.markdown(render_kpi_card(
-            "Tiempo Promedio", 
-            f"{kpis['tiempo_promedio_min']:.1f} min"
-        ), unsafe_allow_html=True)
+    cards_volumen = [
+        render_kpi_card("Creadores", f"{kpis['creadores_activos']:,}"),
+        render_kpi_card("Publicadores", f"{kpis['publicadores_activos']:,}"),
+        render_kpi_card("Notas Publicadas", f"{kpis['notas_publicadas']:,}"),
+        render_kpi_card("Sesiones Únicas", format_number(kpis['visitas_totales'])),
+        render_kpi_card("Usuarios Únicos", format_number(kpis.get('usuarios_unicos', 0))),
+        render_kpi_card("Tiempo Promedio", f"{kpis['tiempo_promedio_min']:.1f} min"),
+    ]
+    st.markdown(
+        '<div style="display:grid; grid-template-columns:repeat(6,1fr); gap:10px;">'
+        + ''.join(cards_volumen) + '</div>',
+        unsafe_allow_html=True
+    )
     
     st.markdown("<br>", unsafe_allow_html=True)
     
-    # Fila inferior - Eficiencia
     st.markdown("##### ⚡ Indicadores de Eficiencia")
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown(render_kpi_card(
-            "Sesiones/Nota", 
-            format_number(kpis['productividad']),
-            highlight=True
-        ), unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(render_kpi_card(
-            "Tasa de Scroll", 
-            f"{kpis['scroll_promedio']:.2%}"
-        ), unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(render_kpi_card(
-            "Pageviews", 
-            format_number(kpis['pageviews_totales'])
-        ), unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown(render_kpi_card(
-            "Sesiones c/ Scroll", 
-            format_number(kpis['scrolls_totales'])
-        ), unsafe_allow_html=True)
+    cards_eficiencia = [
+        render_kpi_card("Sesiones/Nota", format_number(kpis['productividad']), highlight=True),
+        render_kpi_card("Tasa de Scroll", f"{kpis['scroll_promedio']:.2%}"),
+        render_kpi_card("Pageviews", format_number(kpis['pageviews_totales'])),
+        render_kpi_card("Sesiones c/ Scroll", format_number(kpis['scrolls_totales'])),
+    ]
+    st.markdown(
+        '<div style="display:grid; grid-template-columns:repeat(4,1fr); gap:10px;">'
+        + ''.join(cards_eficiencia) + '</div>',
+        unsafe_allow_html=True
+    )
     
     # Leyenda explicativa
     with st.expander("ℹ️ ¿Qué significa cada métrica?", expanded=False):
@@ -1989,6 +1914,41 @@ def render_kpis(kpis: dict, prev_kpis: dict):
         """)
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def _build_geo_fig(filtered_geo: pd.DataFrame) -> go.Figure:
+    """Construye el bar chart geográfico, cacheado por contenido del corte.
+
+    La figura solo cambia cuando cambian la dimensión o los filtros; cachearla
+    evita reconstruir trazas, colorscale y layout en cada rerun del script.
+    """
+    fig = px.bar(
+        filtered_geo.sort_values('total_visits', ascending=True),
+        x='total_visits', y='dimension_value', orientation='h',
+        color='total_visits', color_continuous_scale=['#FFE5D4', NARANJA_INFOBAE]
+    )
+    
+    # Hover mejorado con formato claro
+    fig.update_traces(
+        hovertemplate='<b>%{y}</b><br><br>' +
+                      '📊 Sesiones: <b>%{x:,.0f}</b><extra></extra>'
+    )
+    
+    fig.update_layout(
+        height=350, plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+        showlegend=False, coloraxis_showscale=False,
+        xaxis=dict(gridcolor='#E5E7EB', title='Sesiones', tickformat=',.0f'),
+        yaxis=dict(gridcolor='#E5E7EB', title=''),
+        margin=dict(l=0, r=20, t=20, b=40),
+        hoverlabel=dict(
+            bgcolor="white",
+            font_size=13,
+            font_family="Arial",
+            bordercolor="#E5E7EB"
+        )
+    )
+    return fig
+
+
 def render_impact_zone(top_publishers: pd.DataFrame, top_creators: pd.DataFrame, geo_df: pd.DataFrame):
     """Renderiza la Zona de Impacto: Top Publicadores, Top Creadores y Datos geográficos."""
     
@@ -1999,12 +1959,10 @@ def render_impact_zone(top_publishers: pd.DataFrame, top_creators: pd.DataFrame,
         st.markdown('<div class="section-title">📰 Top 10 Publicadores</div>', unsafe_allow_html=True)
         
         if not top_publishers.empty:
-            display_df = top_publishers.copy()
-            # Renombrar columnas (ahora incluye País)
-            display_df.columns = ['Publicador', 'País', 'Notas']
-            # Formatear país para mostrar bandera
-            pais_flags = {'ARGENTINA': '🇦🇷', 'COLOMBIA': '🇨🇴', 'PERU': '🇵🇪', 'ESPAÑA': '🇪🇸', 'MEXICO': '🇲🇽', 'AMERICA': 'AM'}
-            display_df['País'] = display_df['País'].apply(lambda x: pais_flags.get(str(x).upper(), '') if pd.notna(x) else '')
+            # set_axis + assign devuelven frames nuevos sin copiar los datos
+            # ni mutar el DataFrame cacheado
+            display_df = top_publishers.set_axis(['Publicador', 'País', 'Notas'], axis=1)
+            display_df = display_df.assign(**{'País': display_df['País'].astype(str).str.upper().map(PAIS_FLAGS).fillna('')})
             st.dataframe(display_df, hide_index=True, use_container_width=True, height=350)
         else:
             st.info("No hay datos de publicadores")
@@ -2013,12 +1971,10 @@ def render_impact_zone(top_publishers: pd.DataFrame, top_creators: pd.DataFrame,
         st.markdown('<div class="section-title">✍️ Top 10 Creadores</div>', unsafe_allow_html=True)
         
         if not top_creators.empty:
-            display_df = top_creators.copy()
-            # Renombrar columnas (ahora incluye País)
-            display_df.columns = ['Creador', 'País', 'Notas']
-            # Formatear país para mostrar bandera
-            pais_flags = {'ARGENTINA': '🇦🇷', 'COLOMBIA': '🇨🇴', 'PERU': '🇵🇪', 'ESPAÑA': '🇪🇸', 'MEXICO': '🇲🇽', 'AMERICA': 'AM'}
-            display_df['País'] = display_df['País'].apply(lambda x: pais_flags.get(str(x).upper(), '') if pd.notna(x) else '')
+            # set_axis + assign devuelven frames nuevos sin copiar los datos
+            # ni mutar el DataFrame cacheado
+            display_df = top_creators.set_axis(['Creador', 'País', 'Notas'], axis=1)
+            display_df = display_df.assign(**{'País': display_df['País'].astype(str).str.upper().map(PAIS_FLAGS).fillna('')})
             st.dataframe(display_df, hide_index=True, use_container_width=True, height=350)
         else:
             st.info("No hay datos de creadores")
@@ -2026,23 +1982,6 @@ def render_impact_zone(top_publishers: pd.DataFrame, top_creators: pd.DataFrame,
     # Segunda fila: Datos geográficos
     st.markdown('<div class="section-title">🌍 ¿Desde dónde nos leen?</div>', unsafe_allow_html=True)
     
-    # Traducción de países al español
-    country_translations = {
-        'Argentina': 'Argentina', 'Mexico': 'México', 'Colombia': 'Colombia', 'Spain': 'España',
-        'United States': 'Estados Unidos', 'Peru': 'Perú', 'Chile': 'Chile', 'Ecuador': 'Ecuador',
-        'Venezuela': 'Venezuela', 'Bolivia': 'Bolivia', 'Uruguay': 'Uruguay', 'Paraguay': 'Paraguay',
-        'Guatemala': 'Guatemala', 'Cuba': 'Cuba', 'Dominican Republic': 'República Dominicana',
-        'Honduras': 'Honduras', 'El Salvador': 'El Salvador', 'Nicaragua': 'Nicaragua',
-        'Costa Rica': 'Costa Rica', 'Panama': 'Panamá', 'Puerto Rico': 'Puerto Rico',
-        'Brazil': 'Brasil', 'Germany': 'Alemania', 'France': 'Francia', 'Italy': 'Italia',
-        'United Kingdom': 'Reino Unido', 'Canada': 'Canadá', 'Australia': 'Australia',
-        'Japan': 'Japón', 'China': 'China', 'India': 'India', 'Russia': 'Rusia',
-        'Portugal': 'Portugal', 'Netherlands': 'Países Bajos', 'Belgium': 'Bélgica',
-        'Switzerland': 'Suiza', 'Sweden': 'Suecia', 'Norway': 'Noruega', 'Denmark': 'Dinamarca',
-        'Poland': 'Polonia', 'Austria': 'Austria', 'Ireland': 'Irlanda', 'Israel': 'Israel',
-        '(not set)': 'No especificado'
-    }
-    
     if not geo_df.empty and 'dimension_type' in geo_df.columns:
         available_dims = sorted(geo_df['dimension_type'].dropna().unique().tolist())
         
@@ -2059,44 +1998,17 @@ def render_impact_zone(top_publishers: pd.DataFrame, top_creators: pd.DataFrame,
                 key='geo_dimension'
             )
             
-            filtered_geo = geo_df[geo_df['dimension_type'] == dim_type].nlargest(15, 'total_visits').copy()
+            # nlargest ya devuelve un frame nuevo; no hace falta copy()
+            filtered_geo = geo_df[geo_df['dimension_type'] == dim_type].nlargest(15, 'total_visits')
             
             # Traducir países si es dimensión geográfica
             if dim_type == 'geo':
-                filtered_geo['dimension_value'] = filtered_geo['dimension_value'].apply(
-                    lambda x: country_translations.get(x, x)
-                )
+                filtered_geo['dimension_value'] = (filtered_geo['dimension_value']
+                                                   .map(COUNTRY_TRANSLATIONS)
+                                                   .fillna(filtered_geo['dimension_value']))
             
             if not filtered_geo.empty:
-                # Determinar label según dimensión
-                dim_hover_label = dim_labels.get(dim_type.lower(), dim_type.capitalize()).replace('🌍 ', '').replace('🔗 ', '').replace('📱 ', '').replace('💻 ', '').replace('🏙️ ', '').replace('📍 ', '')
-                
-                fig = px.bar(
-                    filtered_geo.sort_values('total_visits', ascending=True),
-                    x='total_visits', y='dimension_value', orientation='h',
-                    color='total_visits', color_continuous_scale=['#FFE5D4', NARANJA_INFOBAE]
-                )
-                
-                # Hover mejorado con formato claro
-                fig.update_traces(
-                    hovertemplate='<b>%{y}</b><br><br>' +
-                                  '📊 Sesiones: <b>%{x:,.0f}</b><extra></extra>'
-                )
-                
-                fig.update_layout(
-                    height=350, plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-                    showlegend=False, coloraxis_showscale=False,
-                    xaxis=dict(gridcolor='#E5E7EB', title='Sesiones', tickformat=',.0f'),
-                    yaxis=dict(gridcolor='#E5E7EB', title=''),
-                    margin=dict(l=0, r=20, t=20, b=40),
-                    hoverlabel=dict(
-                        bgcolor="white",
-                        font_size=13,
-                        font_family="Arial",
-                        bordercolor="#E5E7EB"
-                    )
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(_build_geo_fig(filtered_geo), use_container_width=True)
     else:
         st.info("Datos geográficos no disponibles")
 
@@ -2131,11 +2043,15 @@ def render_temporal_zone(client, start_date: str, end_date: str, email_filter: s
         st.warning("No hay suficientes datos temporales")
         return
     
-    # Gráfico con trendline
-    fig = px.scatter(daily_data, x='fecha', y='valor', trendline='ols', trendline_color_override='#999999')
-    
+    # Recta de tendencia con un ajuste lineal directo en NumPy: trendline='ols'
+    # de Plotly importa statsmodels y get_trendline_results lo re-ajustaba
+    x = pd.to_datetime(daily_data['fecha']).astype('int64').to_numpy() // 10 ** 9
+    y = daily_data['valor'].to_numpy(dtype='float64')
+    slope, intercept = np.polyfit(x, y, 1)
+
     # Hover mejorado con formato más claro en español
     hover_label = selected_metric
+    fig = go.Figure()
     fig.add_trace(go.Scatter(
         x=daily_data['fecha'], y=daily_data['valor'],
         mode='lines+markers', name=selected_metric,
@@ -2144,12 +2060,12 @@ def render_temporal_zone(client, start_date: str, end_date: str, email_filter: s
         hovertemplate='<b>%{x|%d %b %Y}</b><br>' + 
                       '📊 ' + hover_label + ': <b>%{y:,.0f}</b><extra></extra>'
     ))
-    
-    # Ocultar el scatter original y configurar trendline
-    fig.data[0].visible = False
-    fig.data[1].line.dash = 'dot'
-    fig.data[1].name = 'Tendencia'
-    fig.data[1].hovertemplate = '<b>Tendencia</b><extra></extra>'  # Simplificar hover de tendencia
+    fig.add_trace(go.Scatter(
+        x=daily_data['fecha'], y=slope * x + intercept,
+        mode='lines', name='Tendencia',
+        line=dict(color='#999999', dash='dot'),
+        hovertemplate='<b>Tendencia</b><extra></extra>'
+    ))
     
     fig.update_layout(
         height=380, 
@@ -2172,27 +2088,21 @@ def render_temporal_zone(client, start_date: str, end_date: str, email_filter: s
     st.plotly_chart(fig, use_container_width=True)
     
     # Indicador de tendencia con explicación
-    try:
-        results = px.get_trendline_results(fig)
-        if not results.empty:
-            slope = results.iloc[0]["px_fit_results"].params[1]
-            if slope > 0:
-                trend_text = "📈 Tendencia al ALZA"
-                trend_explanation = "Los valores están creciendo en promedio día a día"
-                color = "#10B981"
-            else:
-                trend_text = "📉 Tendencia a la BAJA"
-                trend_explanation = "Los valores están decreciendo en promedio día a día"
-                color = "#EF4444"
-            
-            st.markdown(f"""
-                <div style='text-align:center; margin-top: 5px;'>
-                    <span style='color:{color}; font-weight:600; font-size: 1rem;'>{trend_text}</span>
-                    <span style='color: #9CA3AF; font-size: 0.8rem; margin-left: 10px;'>— {trend_explanation}</span>
-                </div>
-            """, unsafe_allow_html=True)
-    except:
-        pass
+    if slope > 0:
+        trend_text = "📈 Tendencia al ALZA"
+        trend_explanation = "Los valores están creciendo en promedio día a día"
+        color = "#10B981"
+    else:
+        trend_text = "📉 Tendencia a la BAJA"
+        trend_explanation = "Los valores están decreciendo en promedio día a día"
+        color = "#EF4444"
+    
+    st.markdown(f"""
+        <div style='text-align:center; margin-top: 5px;'>
+            <span style='color:{color}; font-weight:600; font-size: 1rem;'>{trend_text}</span>
+            <span style='color: #9CA3AF; font-size: 0.8rem; margin-left: 10px;'>— {trend_explanation}</span>
+        </div>
+    """, unsafe_allow_html=True)
 
 
 def render_section_analysis(section_stats: pd.DataFrame):
@@ -2204,11 +2114,8 @@ def render_section_analysis(section_stats: pd.DataFrame):
         st.warning("No hay datos de secciones disponibles")
         return
     
-    # Preparar DataFrame para mostrar
-    display_df = section_stats.copy()
-    
-    # Renombrar columnas
-    display_df = display_df.rename(columns={
+    # Preparar DataFrame para mostrar (rename ya devuelve un frame nuevo)
+    display_df = section_stats.rename(columns={
         'seccion': 'Sección',
         'notas': 'Notas',
         'composer': 'Composer',
@@ -2219,14 +2126,12 @@ def render_section_analysis(section_stats: pd.DataFrame):
         'productividad': 'Sesiones/Nota'
     })
     
-    # Formatear números
-    display_df['Notas'] = display_df['Notas'].apply(lambda x: f"{int(x):,}".replace(",", ".") if pd.notna(x) else "0")
-    display_df['Composer'] = display_df['Composer'].apply(lambda x: f"{int(x):,}".replace(",", ".") if pd.notna(x) else "0")
-    display_df['Scribnews'] = display_df['Scribnews'].apply(lambda x: f"{int(x):,}".replace(",", ".") if pd.notna(x) else "0")
-    display_df['Sesiones'] = display_df['Sesiones'].apply(lambda x: f"{int(x):,}".replace(",", ".") if pd.notna(x) else "0")
-    display_df['Pageviews'] = display_df['Pageviews'].apply(lambda x: f"{int(x):,}".replace(",", ".") if pd.notna(x) else "0")
-    display_df['Scroll'] = display_df['Scroll'].apply(lambda x: f"{x:.2%}" if pd.notna(x) else "0.00%")
-    display_df['Sesiones/Nota'] = display_df['Sesiones/Nota'].apply(lambda x: f"{int(x):,}".replace(",", ".") if pd.notna(x) and x > 0 else "-")
+    # Las columnas quedan numéricas: el formato (separador de miles, %) lo
+    # aplica el front vía column_config, el grid ordena por valor y el
+    # payload Arrow viaja como números en vez de strings
+    display_df = display_df.assign(**{
+        'Sesiones/Nota': display_df['Sesiones/Nota'].where(display_df['Sesiones/Nota'] > 0).round().astype('Int64'),
+    })
     
     st.dataframe(
         display_df, 
@@ -2235,13 +2140,13 @@ def render_section_analysis(section_stats: pd.DataFrame):
         height=450,
         column_config={
             "Sección": st.column_config.TextColumn("Sección", width="medium"),
-            "Notas": st.column_config.TextColumn("Notas", help="Total de notas publicadas"),
-            "Composer": st.column_config.TextColumn("Composer", help="Notas creadas en Composer"),
-            "Scribnews": st.column_config.TextColumn("Scribnews", help="Notas creadas en Scribnews"),
-            "Sesiones": st.column_config.TextColumn("Sesiones", help="Visitas únicas totales"),
-            "Pageviews": st.column_config.TextColumn("Pageviews", help="Páginas vistas totales"),
-            "Scroll": st.column_config.TextColumn("Scroll", help="% promedio de scroll (90% del artículo)"),
-            "Sesiones/Nota": st.column_config.TextColumn("Sesiones/Nota", help="Promedio de sesiones por nota publicada")
+            "Notas": st.column_config.NumberColumn("Notas", format="localized", help="Total de notas publicadas"),
+            "Composer": st.column_config.NumberColumn("Composer", format="localized", help="Notas creadas en Composer"),
+            "Scribnews": st.column_config.NumberColumn("Scribnews", format="localized", help="Notas creadas en Scribnews"),
+            "Sesiones": st.column_config.NumberColumn("Sesiones", format="localized", help="Visitas únicas totales"),
+            "Pageviews": st.column_config.NumberColumn("Pageviews", format="localized", help="Páginas vistas totales"),
+            "Scroll": st.column_config.NumberColumn("Scroll", format="percent", help="% promedio de scroll (90% del artículo)"),
+            "Sesiones/Nota": st.column_config.NumberColumn("Sesiones/Nota", format="localized", help="Promedio de sesiones por nota publicada")
         }
     )
 
@@ -2480,8 +2385,6 @@ def render_author_scatter(_client, start_date: str, end_date: str, email_filter:
     
     # Insights automáticos
     if not author_stats.empty and len(author_stats) >= 3:
-        col1, col2, col3 = st.columns(3)
-        
         # Etiqueta dinámica para "más productivo"
         productive_label_map = {
             "created": "notas creadas",
@@ -2490,38 +2393,41 @@ def render_author_scatter(_client, start_date: str, end_date: str, email_filter:
         }
         productive_label = productive_label_map[metric_type]
         
-        # Autor más eficiente (mayor sesiones/nota)
-        top_efficient = author_stats.nlargest(1, 'eficiencia').iloc[0]
-        with col1:
-            st.markdown(f"""
-                <div style='background: #FEF3C7; padding: 12px 15px; border-radius: 8px; border-left: 4px solid #F59E0B;'>
-                    <div style='font-size: 0.7rem; color: #92400E; text-transform: uppercase; font-weight: 600;'>🏆 Más Eficiente</div>
-                    <div style='font-weight: 700; color: #78350F; font-size: 0.95rem; margin: 5px 0;'>{top_efficient['autor']}</div>
-                    <div style='font-size: 0.9rem; color: #92400E; font-weight: 600;'>{int(top_efficient['eficiencia']):,} ses/nota</div>
-                </div>
-            """, unsafe_allow_html=True)
-        
-        # Autor más productivo (más notas)
-        top_productive = author_stats.nlargest(1, 'notas_creadas').iloc[0]
-        with col2:
-            st.markdown(f"""
-                <div style='background: #DBEAFE; padding: 12px 15px; border-radius: 8px; border-left: 4px solid #3B82F6;'>
-                    <div style='font-size: 0.7rem; color: #1E40AF; text-transform: uppercase; font-weight: 600;'>📝 Más Productivo</div>
-                    <div style='font-weight: 700; color: #1E3A8A; font-size: 0.95rem; margin: 5px 0;'>{top_productive['autor']}</div>
-                    <div style='font-size: 0.9rem; color: #1E40AF; font-weight: 600;'>{int(top_productive['notas_creadas'])} {productive_label}</div>
-                </div>
-            """, unsafe_allow_html=True)
+        # idxmax es un scan lineal, sin el sort parcial ni el frame
+        # intermedio de nlargest(1)
+        top_efficient = author_stats.loc[author_stats['eficiencia'].idxmax()]
+        top_productive = author_stats.loc[author_stats['notas_creadas'].idxmax()]
+        top_reach = author_stats.loc[author_stats['sesiones_totales'].idxmax()]
         
-        # Autor con más alcance (más sesiones)
-        top_reach = author_stats.nlargest(1, 'sesiones_totales').iloc[0]
-        with col3:
-            st.markdown(f"""
-                <div style='background: #D1FAE5; padding: 12px 15px; border-radius: 8px; border-left: 4px solid #10B981;'>
-                    <div style='font-size: 0.7rem; color: #065F46; text-transform: uppercase; font-weight: 600;'>🌍 Mayor Alcance</div>
-                    <div style='font-weight: 700; color: #064E3B; font-size: 0.95rem; margin: 5px 0;'>{top_reach['autor']}</div>
-                    <div style='font-size: 0.9rem; color: #065F46; font-weight: 600;'>{format_number(top_reach['sesiones_totales'])} sesiones</div>
-                </div>
-            """, unsafe_allow_html=True)
+        # Las tres tarjetas salen en un solo st.markdown (un elemento
+        # serializado en vez de tres columnas con uno cada una)
+        cards = f"""
+            <div style='flex: 1; background: #FEF3C7; padding: 12px 15px; border-radius: 8px; border-left: 4px solid #F59E0B;'>
+                <div style='font-size: 0.7rem; color: #92400E; text-transform: uppercase; font-weight: 600;'>🏆 Más Eficiente</div>
+                <div style='font-weight: 700; color: #78350F; font-size: 0.95rem; margin: 5px 0;'>{top_efficient['autor']}</div>
+                <div style='font-size: 0.9rem; color: #92400E; font-weight: 600;'>{int(top_efficient['eficiencia']):,} ses/nota</div>
+            </div>
+            <div style='flex: 1; background: #DBEAFE; padding: 12px 15px; border-radius: 8px; border-left: 4px solid #3B82F6;'>
+                <div style='font-size: 0.7rem; color: #1E40AF; text-transform: uppercase; font-weight: 600;'>📝 Más Productivo</div>
+                <div style='font-weight: 700; color: #1E3A8A; font-size: 0.95rem; margin: 5px 0;'>{top_productive['autor']}</div>
+                <div style='font-size: 0.9rem; color: #1E40AF; font-weight: 600;'>{int(top_productive['notas_creadas'])} {productive_label}</div>
+            </div>
+            <div style='flex: 1; background: #D1FAE5; padding: 12px 15px; border-radius: 8px; border-left: 4px solid #10B981;'>
+                <div style='font-size: 0.7rem; color: #065F46; text-transform: uppercase; font-weight: 600;'>🌍 Mayor Alcance</div>
+                <div style='font-weight: 700; color: #064E3B; font-size: 0.95rem; margin: 5px 0;'>{top_reach['autor']}</div>
+                <div style='font-size: 0.9rem; color: #065F46; font-weight: 600;'>{format_number(top_reach['sesiones_totales'])} sesiones</div>
+            </div>
+        """
+        st.markdown(
+            f"<div style='display:flex; gap:10px;'>{cards}</div>",
+            unsafe_allow_html=True
+        )
+
+
+@st.cache_data(show_spinner=False)
+def _to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """Serializa la tabla a CSV una vez por contenido, no por rerun."""
+    return df.to_csv(index=False).encode('utf-8')
 
 
 def render_data_grid(top_articles: pd.DataFrame):
@@ -2533,11 +2439,8 @@ def render_data_grid(top_articles: pd.DataFrame):
         st.warning("No hay datos para mostrar")
         return
     
-    # Preparar DataFrame para mostrar
-    display_df = top_articles.copy()
-    
-    # Renombrar columnas
-    display_df = display_df.rename(columns={
+    # Preparar DataFrame para mostrar (rename ya devuelve un frame nuevo)
+    display_df = top_articles.rename(columns={
         'url': 'URL',
         'titulo': 'Título',
         'seccion': 'Sección',
@@ -2555,12 +2458,12 @@ def render_data_grid(top_articles: pd.DataFrame):
     cols_order = ['Título', 'Sección', 'Creador', 'Publicador', 'Fuente', 'Pal. Título', 'Pal. Body', 'Sesiones', 'Pageviews', 'Scroll', 'URL']
     display_df = display_df[[c for c in cols_order if c in display_df.columns]]
     
-    # Formatear números con separador de miles
-    display_df['Sesiones'] = display_df['Sesiones'].apply(lambda x: f"{int(x):,}".replace(",", ".") if pd.notna(x) else "0")
-    display_df['Pageviews'] = display_df['Pageviews'].apply(lambda x: f"{int(x):,}".replace(",", ".") if pd.notna(x) else "0")
-    display_df['Scroll'] = display_df['Scroll'].apply(lambda x: f"{x:.2%}" if pd.notna(x) else "0.00%")
-    display_df['Pal. Título'] = display_df['Pal. Título'].apply(lambda x: f"{int(x):,}".replace(",", ".") if pd.notna(x) and x > 0 else "-")
-    display_df['Pal. Body'] = display_df['Pal. Body'].apply(lambda x: f"{int(x):,}".replace(",", ".") if pd.notna(x) and x > 0 else "-")
+    # Columnas numéricas sin stringificar: formatea el front (column_config),
+    # el grid ordena por valor y el CSV exporta números crudos
+    display_df = display_df.assign(**{
+        col: display_df[col].where(display_df[col] > 0).astype('Int64')
+        for col in ['Pal. Título', 'Pal. Body']
+    })
     
     # Configuración de columnas
     column_config = {
@@ -2574,24 +2477,27 @@ def render_data_grid(top_articles: pd.DataFrame):
             help="Abrir artículo",
             display_text="Abrir"
         ),
-        "Sesiones": st.column_config.TextColumn(
+        "Sesiones": st.column_config.NumberColumn(
             "Sesiones",
+            format="localized",
             help="Visitas únicas (una sesión = un usuario en un dispositivo)"
         ),
-        "Pageviews": st.column_config.TextColumn(
+        "Pageviews": st.column_config.NumberColumn(
             "Pageviews",
+            format="localized",
             help="Total de páginas vistas (incluye recargas)"
         ),
-        "Scroll": st.column_config.TextColumn(
+        "Scroll": st.column_config.NumberColumn(
             "Scroll",
+            format="percent",
             help="% de sesiones que llegaron al 90% del artículo (estándar GA4)"
         ),
         "Sección": st.column_config.TextColumn("Sección", width="small"),
         "Creador": st.column_config.TextColumn("Creador", width="medium", help="Email del creador del artículo"),
         "Publicador": st.column_config.TextColumn("Publicador", width="medium", help="Email de quien publicó el artículo"),
         "Fuente": st.column_config.TextColumn("Fuente", width="small", help="Sistema de producción (Composer/Scribnews)"),
-        "Pal. Título": st.column_config.TextColumn("Pal. Título", width="small", help="Cantidad de palabras en el título"),
-        "Pal. Body": st.column_config.TextColumn("Pal. Body", width="small", help="Cantidad de palabras en el cuerpo del artículo")
+        "Pal. Título": st.column_config.NumberColumn("Pal. Título", width="small", format="localized", help="Cantidad de palabras en el título"),
+        "Pal. Body": st.column_config.NumberColumn("Pal. Body", width="small", format="localized", help="Cantidad de palabras en el cuerpo del artículo")
     }
     
     st.dataframe(
@@ -2602,9 +2508,9 @@ def render_data_grid(top_articles: pd.DataFrame):
         column_config=column_config
     )
     
-    # Botón de descarga
-    csv = display_df.to_csv(index=False)
-    st.download_button("📥 Descargar CSV", csv, "infobae_editorial_data.csv", "text/csv", key='download-csv')
+    # Botón de descarga (bytes cacheados por contenido: el CSV no se
+    # re-serializa en cada rerun si la tabla no cambió)
+    st.download_button("📥 Descargar CSV", _to_csv_bytes(display_df), "infobae_editorial_data.csv", "text/csv", key='download-csv')
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # APLICACIÓN PRINCIPAL
@@ -2675,26 +2581,24 @@ def main():
         filter_options = load_filter_options(client, start_str, end_str)
         
         # Dropdown de Creador/Publicador (muestra nombre, filtra por email)
-        email_display_options = ["Todos"] + list(filter_options['email_options'].keys())
         selected_display_name = st.selectbox(
             "Creador/Publicador", 
-            options=email_display_options,
+            options=filter_options['email_display_options'],
             index=0, 
             key="email_filter"
         )
         
         # Filtro por país
-        pais_options = ["Todos"] + filter_options['paises']
         selected_pais = st.selectbox(
             "País del autor",
-            options=pais_options,
+            options=filter_options['paises_options'],
             index=0,
             key="pais_filter"
         )
         
         selected_section = st.selectbox(
             "Sección", 
-            options=["Todas"] + filter_options['secciones'],
+            options=filter_options['secciones_options'],
             index=0, 
             key="section_filter"
         )
@@ -2711,45 +2615,83 @@ def main():
     seccion_filter = selected_section if selected_section != "Todas" else None
     pais_filter = selected_pais if selected_pais != "Todos" else None
     
-    # Cargar datos optimizados (con filtros aplicados)
+    # Canonicalizar antes de pasar a los loaders: los filtros son parte de la
+    # clave de caché (st.cache_data + disco) y un string vacío, un espacio o
+    # una mayúscula distinta fragmentan la clave sin cambiar la query
+    email_filter = email_filter.strip() or None if email_filter else None
+    seccion_filter = seccion_filter.strip() or None if seccion_filter else None
+    pais_filter = pais_filter.strip().upper() or None if pais_filter else None
+    
+    # Cargar datos optimizados (con filtros aplicados). Los loaders no dependen
+    # entre sí, así que se lanzan en paralelo.
     with st.spinner("🔄 Cargando datos..."):
-        kpis = load_kpis(client, start_str, end_str, email_filter, seccion_filter, pais_filter)
-        prev_kpis = load_previous_kpis(client, start_str, end_str, email_filter, seccion_filter, pais_filter)
-        top_publishers = load_top_publishers(client, start_str, end_str, 10, email_filter, seccion_filter, pais_filter)
-        top_creators = load_top_creators(client, start_str, end_str, 10, email_filter, seccion_filter, pais_filter)
-        geo_df = load_geo_data(client, start_str, end_str, email_filter, seccion_filter, pais_filter)
-        section_stats = load_section_stats(client, start_str, end_str, email_filter, seccion_filter, pais_filter)
-        top_articles = load_top_articles(client, start_str, end_str, 100, email_filter, seccion_filter, pais_filter)
-        # Nuevas métricas de análisis
-        source_efficiency = load_source_efficiency(client, start_str, end_str, email_filter, seccion_filter, pais_filter)
-    
-    # Renderizar dashboard
-    st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
+        filtros = (email_filter, seccion_filter, pais_filter)
+        data = _parallel_fetch({
+            'kpis_pair': (load_kpis_pair, client, start_str, end_str, *filtros),
+            'top_publishers': (load_top_publishers, client, start_str, end_str, 10, *filtros),
+            'top_creators': (load_top_creators, client, start_str, end_str, 10, *filtros),
+            'geo_df': (load_geo_data, client, start_str, end_str, *filtros),
+            'section_stats': (load_section_stats, client, start_str, end_str, *filtros),
+            'top_articles': (load_top_articles, client, start_str, end_str, 100, *filtros),
+            'source_efficiency': (load_source_efficiency, client, start_str, end_str, *filtros),
+            # Precalienta la métrica default del scatter de autores; el render
+            # la toma del caché y solo re-consulta si cambian el selector
+            'author_productivity': (load_author_productivity, client, start_str, end_str, *filtros),
+        })
+        kpis, prev_kpis = data['kpis_pair']
+        top_publishers = data['top_publishers']
+        top_creators = data['top_creators']
+        geo_df = data['geo_df']
+        section_stats = data['section_stats']
+        top_articles = data['top_articles']
+        source_efficiency = data['source_efficiency']
+    
+    # Renderizar dashboard: la línea separadora viene del CSS de
+    # .section-title, no de elementos divider individuales
     render_kpis(kpis, prev_kpis)
     
-    st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
     render_impact_zone(top_publishers, top_creators, geo_df)
     
-    st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
     render_temporal_zone(client, start_str, end_str, email_filter, seccion_filter, pais_filter)
     
-    st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
     render_section_analysis(section_stats)
     
     # Nuevas secciones de análisis estratégico
-    st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
     render_source_efficiency(source_efficiency)
     
-    st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
     render_author_scatter(client, start_str, end_str, email_filter, seccion_filter, pais_filter)
     
-    st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
     render_data_grid(top_articles)
     
+    # Prefetch especulativo: el movimiento más común tras el primer render es
+    # mirar el período anterior; se precalientan sus cachés en un hilo daemon
+    # (secuencial, para no competir por slots), una vez por sesión y por
+    # combinación de ventana + filtros
+    prefetch_key = f"prefetch_{start_str}_{end_str}_{filtros}"
+    if not st.session_state.get(prefetch_key):
+        st.session_state[prefetch_key] = True
+        dias = (end - start).days + 1
+        prev_end_str = str(start - timedelta(days=1))
+        prev_start_str = str(start - timedelta(days=dias))
+
+        def _warm_prev_period():
+            for loader, args in (
+                (load_kpis_pair, (client, prev_start_str, prev_end_str, *filtros)),
+                (load_all_daily, (client, prev_start_str, prev_end_str, *filtros)),
+                (load_top_articles, (client, prev_start_str, prev_end_str, 100, *filtros)),
+            ):
+                try:
+                    loader(*args)
+                except Exception:
+                    pass  # es especulativo: un fallo acá no afecta la sesión
+
+        hilo = threading.Thread(target=_warm_prev_period, daemon=True)
+        add_script_run_ctx(hilo, get_script_run_ctx())
+        hilo.start()
+
     # Footer
-    st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
     st.markdown(f"""
-        <p style="text-align: center; color: {GRIS_TEXTO}; font-size: 0.8rem;">
+        <p style="text-align: center; color: {GRIS_TEXTO}; font-size: 0.8rem; border-top: 2px solid #F26522; padding-top: 30px; margin-top: 30px;">
             📰 Infobae Centro de Control Editorial | {datetime.now().strftime('%d/%m/%Y %H:%M')}
         </p>
     """, unsafe_allow_html=True)